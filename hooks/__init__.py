@@ -18,9 +18,12 @@ Lifecycle Interface (startup/shutdown):
 
 import importlib.util
 import logging
+import os
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 log = logging.getLogger("comfy-viewer.hooks")
 
@@ -28,6 +31,11 @@ HOOKS_DIR = Path(__file__).parent
 HOOKS_LOCAL_DIR = HOOKS_DIR.parent / "hooks.local"
 EXTRA_HOOKS_DIR: Optional[Path] = None
 
+# Loaded hook modules by file path, with the st_mtime_ns they were loaded at
+_module_cache: dict[Path, tuple[int, Any]] = {}
+# Guards check-and-load, so a hook is never executed by two threads at once
+_module_lock = threading.RLock()
+
 
 def set_extra_hooks_dir(path: Optional[Path]) -> None:
     """Override or clear the external hooks directory."""
@@ -47,14 +55,51 @@ def _hook_dirs() -> list[Path]:
     return dirs
 
 
+def _package_mtime(package_dir: Path) -> int:
+    """Newest st_mtime_ns of any .py file in a hook package, submodules included."""
+    newest = 0
+    stack = [str(package_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "__pycache__":
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    newest = max(newest, entry.stat().st_mtime_ns)
+    return newest
+
+
 def _load_module(name: str, file_path: Path, is_package: bool = False):
     """
     Dynamically load a Python module from a file path.
 
     Modules are registered under comfy_viewer_hooks.{name} to avoid
     polluting sys.modules with bare names like "conduit" or "_default".
+    A module is executed again only when its file (for packages, any .py
+    file in the package) changes mtime, so edited hooks still take effect
+    without a restart.
     """
+    with _module_lock:
+        if is_package:
+            mtime = _package_mtime(file_path.parent)
+        else:
+            mtime = os.stat(file_path).st_mtime_ns
+        cached = _module_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        module = _exec_module(name, file_path, is_package)
+        _module_cache[file_path] = (mtime, module)
+        return module
+
+
+def _exec_module(name: str, file_path: Path, is_package: bool):
+    """Execute a hook module fresh. Caller must hold _module_lock."""
     qualified_name = f"comfy_viewer_hooks.{name}"
+    # Drop a package's previously imported submodules so they reload too
+    prefix = qualified_name + "."
+    for stale in [key for key in sys.modules if key.startswith(prefix)]:
+        del sys.modules[stale]
 
     if is_package:
         spec = importlib.util.spec_from_file_location(
@@ -81,21 +126,26 @@ def _get_hooks() -> list[tuple[str, Path, bool]]:
     hooks_by_name: dict[str, tuple[str, Path, bool]] = {}
 
     for hook_dir in _hook_dirs():
-        if not hook_dir.exists() or not hook_dir.is_dir():
+        try:
+            entries = list(os.scandir(hook_dir))
+        except (FileNotFoundError, NotADirectoryError):
             continue
 
-        # Find single-file hooks (*.py, skip __*.py like __init__.py)
-        for hook_file in hook_dir.glob("*.py"):
-            if hook_file.name.startswith("__"):
-                continue
-            hooks_by_name[hook_file.stem] = (hook_file.stem, hook_file, False)
+        # Skip __*.py like __init__.py and dunder folders like __pycache__
+        entries = [e for e in entries if not e.name.startswith("__")]
+
+        # Find single-file hooks (*.py)
+        for entry in entries:
+            if entry.name.endswith(".py") and entry.is_file():
+                stem = entry.name[:-3]
+                hooks_by_name[stem] = (stem, Path(entry.path), False)
 
         # Find hook packages (folders with __init__.py)
-        for item in hook_dir.iterdir():
-            if item.is_dir() and not item.name.startswith("__"):
-                init_file = item / "__init__.py"
-                if init_file.exists():
-                    hooks_by_name[item.name] = (item.name, init_file, True)
+        for entry in entries:
+            if entry.is_dir():
+                init_file = os.path.join(entry.path, "__init__.py")
+                if os.path.exists(init_file):
+                    hooks_by_name[entry.name] = (entry.name, Path(init_file), True)
 
     # Sort by hook name (alphabetically)
     return sorted(hooks_by_name.values(), key=lambda x: x[0])
@@ -144,36 +194,90 @@ def list_hooks() -> list[str]:
 # ─────────────────────────────────────────────────────────────
 
 _lifecycle_modules: list = []
+_lifecycle_lock = threading.Lock()
+
+# Seconds shutdown_lifecycle waits for background lifecycle hooks to finish
+LIFECYCLE_SHUTDOWN_TIMEOUT = 10.0
+
+# Single worker for background lifecycle hooks, so they keep their order;
+# futures are kept so shutdown can wait for them
+_lifecycle_executor: Optional[ThreadPoolExecutor] = None
+_lifecycle_futures: list[Future] = []
+
+
+def _run_lifecycle_hook(point: str, hook_name: str, hook_file: Path, is_package: bool, context: dict) -> None:
+    fn_name = f"on_{point}"
+    try:
+        module = _load_module(hook_name, hook_file, is_package)
+        if hasattr(module, fn_name):
+            getattr(module, fn_name)(context)
+            with _lifecycle_lock:
+                if module not in _lifecycle_modules:
+                    _lifecycle_modules.append(module)
+            log.info(f"Lifecycle '{point}': {hook_name}")
+    except Exception as e:
+        log.error(f"Lifecycle hook '{hook_name}' failed on {point}: {e}")
 
 
-def run_lifecycle(point: str, context: dict) -> None:
+def run_lifecycle(point: str, context: dict, background: bool = False) -> None:
     """
     Run lifecycle hooks across all hook directories.
 
     Scans hooks/, hooks.local/, and extra dirs for modules with
     an on_{point}(context) function and calls them in order.
-    """
-    fn_name = f"on_{point}"
-
-    for hook_name, hook_file, is_package in _get_hooks():
-        try:
-            module = _load_module(hook_name, hook_file, is_package)
-            if hasattr(module, fn_name):
-                getattr(module, fn_name)(context)
-                if module not in _lifecycle_modules:
-                    _lifecycle_modules.append(module)
-                log.info(f"Lifecycle '{point}': {hook_name}")
-        except Exception as e:
-            log.error(f"Lifecycle hook '{hook_name}' failed on {point}: {e}")
 
+    With background=True the hooks are queued on a background worker and
+    this returns immediately, so a hook that blocks (e.g. connecting to an
+    external transport) cannot stall app startup. They still run one at a
+    time in alphabetical order; shutdown_lifecycle waits for them.
+    """
+    global _lifecycle_executor
+    hooks = _get_hooks()
+    if not background:
+        for hook_name, hook_file, is_package in hooks:
+            _run_lifecycle_hook(point, hook_name, hook_file, is_package, context)
+        return
+
+    with _lifecycle_lock:
+        if _lifecycle_executor is None:
+            _lifecycle_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hook-lifecycle")
+        for hook_name, hook_file, is_package in hooks:
+            _lifecycle_futures.append(_lifecycle_executor.submit(
+                _run_lifecycle_hook, point, hook_name, hook_file, is_package, context
+            ))
+
+
+def _wait_for_background_hooks(timeout: float) -> None:
+    """Wait for queued lifecycle hooks, then drop any that have not started."""
+    global _lifecycle_executor
+    with _lifecycle_lock:
+        executor, _lifecycle_executor = _lifecycle_executor, None
+        futures = list(_lifecycle_futures)
+        _lifecycle_futures.clear()
+    if executor is None:
+        return
+
+    _, not_done = wait(futures, timeout=timeout)
+    if not_done:
+        log.warning(f"{len(not_done)} lifecycle hook(s) still running after {timeout}s; skipping their shutdown")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_lifecycle(timeout: float = LIFECYCLE_SHUTDOWN_TIMEOUT) -> None:
+    """
+    Call on_shutdown on all modules that participated in lifecycle.
 
-def shutdown_lifecycle() -> None:
-    """Call on_shutdown on all modules that participated in lifecycle."""
-    for module in _lifecycle_modules:
+    Background lifecycle hooks are waited on first (up to timeout), so a
+    slow on_startup that finishes in time still gets its on_shutdown.
+    """
+    _wait_for_background_hooks(timeout)
+    with _lifecycle_lock:
+        modules = list(_lifecycle_modules)
+        _lifecycle_modules.clear()
+    for module in modules:
         try:
             if hasattr(module, "on_shutdown"):
                 module.on_shutdown({})
                 log.info(f"Shutdown: {module.__name__}")
         except Exception as e:
             log.error(f"Shutdown hook '{module.__name__}' failed: {e}")
-    _lifecycle_modules.clear()
@@ -7,14 +7,19 @@ A clean, real-time interface for ComfyUI with:
 - Gallery viewer and settings editor
 """
 
+import hashlib
 import json
 import logging
 import os
+import queue
 import random
+import threading
 import uuid
 from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
 
-from flask import Flask, jsonify, request, render_template, send_from_directory, Response
+from flask import Flask, jsonify, request, render_template, send_file, send_from_directory, Response
 
 from . import config as app_config
 from .emit import emit, configure as emit_configure
@@ -22,8 +27,8 @@ from .version import __version__
 from .state import get_state_manager
 from .comfy_client import get_comfy_client
 from .websocket_server import init_socketio
-from .thumbnails import get_thumbnail, get_thumbnail_for_bytes, generate_all_thumbnails, get_cache_stats, cleanup_orphaned_thumbnails, CACHE_DIR
-from .registrations import get_store, select_preferred_image, get_relative_image_path
+from .thumbnails import get_thumbnail, get_thumbnail_for_bytes, get_cached_thumbnail_for_bytes, generate_all_thumbnails, get_cache_stats, cleanup_orphaned_thumbnails, CACHE_DIR
+from .registrations import get_store, load_hooks, select_preferred_image, get_relative_image_path
 from .file_service import get_file_service, reset_file_service, FileService
 
 # ─────────────────────────────────────────────────────────────
@@ -46,10 +51,9 @@ emit("config.resolved", {
     "config_path": str(CONFIG.get("_config_path", "")),
     "host": CONFIG.get("host", "0.0.0.0"),
     "port": CONFIG.get("port", 5000),
-})
+}, flush=True)
 if CONFIG.get("hooks_dir"):
-    from comfy_viewer_hooks import set_extra_hooks_dir
-    set_extra_hooks_dir(Path(CONFIG["hooks_dir"]))
+    load_hooks().set_extra_hooks_dir(Path(CONFIG["hooks_dir"]))
 
 # ─────────────────────────────────────────────────────────────
 # Logging
@@ -73,7 +77,7 @@ app = Flask(
     template_folder=str(PACKAGE_ROOT / "templates"),
     static_folder=str(PACKAGE_ROOT / "static")
 )
-socketio = init_socketio(app)
+socketio = init_socketio(app, CONFIG.get("async_mode", "threading"))
 
 # Global instances
 state = get_state_manager()
@@ -84,6 +88,30 @@ file_service: FileService = get_file_service(CONFIG)
 # Display Field Mapping
 # ─────────────────────────────────────────────────────────────
 
+_display_cache: Optional[tuple[dict, tuple[str, str, str, str]]] = None
+
+
+def _display_slots() -> tuple[str, str, str, str]:
+    """
+    Resolve (title_field, title_label, data_field, data_label) from config.
+
+    Cached against the current CONFIG["display"] object so per-image
+    mapping is just tuple unpacking; replacing that dict invalidates it.
+    """
+    global _display_cache
+    display_cfg = CONFIG.get("display", {})
+    if _display_cache is None or _display_cache[0] is not display_cfg:
+        title_cfg = display_cfg.get("title", {"field": "char_str", "label": "Title"})
+        data_cfg = display_cfg.get("data", {"field": "prompt", "label": "Data"})
+        _display_cache = (display_cfg, (
+            title_cfg.get("field", "char_str"),
+            title_cfg.get("label", "Title"),
+            data_cfg.get("field", "prompt"),
+            data_cfg.get("label", "Data"),
+        ))
+    return _display_cache[1]
+
+
 def map_display_fields(reg: dict) -> dict:
     """
     Map extracted fields to title/data display slots based on config.
@@ -91,26 +119,24 @@ def map_display_fields(reg: dict) -> dict:
     The config determines which hook fields map to which UI slots,
     making it easy to change what's displayed without code changes.
     """
-    display_cfg = CONFIG.get("display", {})
-    title_cfg = display_cfg.get("title", {"field": "char_str", "label": "Title"})
-    data_cfg = display_cfg.get("data", {"field": "prompt", "label": "Data"})
+    title_field, title_label, data_field, data_label = _display_slots()
+    # Look in the data blob for fields other than the char_str column
+    data_blob = reg.get("data", {}) or {}
 
     def get_field_value(field_name: str):
         """Get field value from char_str column or data blob."""
         if field_name == "char_str":
             return reg.get("char_str")
-        # Look in the data blob for other fields
-        data_blob = reg.get("data", {}) or {}
         return data_blob.get(field_name)
 
     # Add mapped display fields to registration
     reg["title"] = {
-        "value": get_field_value(title_cfg.get("field", "char_str")),
-        "label": title_cfg.get("label", "Title"),
+        "value": get_field_value(title_field),
+        "label": title_label,
     }
     reg["data"] = {
-        "value": get_field_value(data_cfg.get("field", "prompt")),
-        "label": data_cfg.get("label", "Data"),
+        "value": get_field_value(data_field),
+        "label": data_label,
     }
 
     return reg
@@ -269,6 +295,11 @@ def serve_image(filename):
     # Stream the image through the file service
     content_type = file_service.get_content_type(filename)
 
+    # Local files go through send_file so the server can use sendfile()
+    local_path = file_service.get_image_path(filename)
+    if local_path:
+        return send_file(local_path, mimetype=content_type)
+
     def generate():
         for chunk in file_service.stream_image(filename):
             yield chunk
@@ -302,7 +333,12 @@ def serve_thumbnail(filename):
                 mimetype=file_service.get_content_type(filename)
             )
     else:
-        # Remote mode: get image bytes and generate thumbnail from memory
+        # Remote mode: serve a cached thumbnail without downloading the image
+        thumb_data = get_cached_thumbnail_for_bytes(filename)
+        if thumb_data:
+            return Response(thumb_data, mimetype="image/webp")
+
+        # Otherwise get image bytes and generate thumbnail from memory
         image_data = file_service.get_image(filename)
         if image_data is None:
             return "Failed to fetch image", 500
@@ -333,11 +369,85 @@ def api_files_list():
         subdir: Optional subdirectory to list
 
     Returns:
-        {"images": [ImageInfo...]}
+        {"images": [ImageInfo...]}, or 304 when If-None-Match matches
     """
     subdir = request.args.get("subdir", "")
     images = file_service.list_images(subdir)
-    return jsonify({"images": [img.to_dict() for img in images]})
+
+    # ETag over (filename, size, mtime) lets pollers skip unchanged listings
+    digest = hashlib.md5(usedforsecurity=False)
+    for img in images:
+        digest.update(f"{img.filename}\0{img.size}\0{img.modified}\n".encode())
+    etag = digest.hexdigest()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = jsonify({"images": [img.to_dict() for img in images]})
+    response.set_etag(etag)
+    return response
+
+
+# Queues of connected /api/files/events clients
+FILE_EVENT_QUEUE_SIZE = 1000
+FILE_EVENT_KEEPALIVE = 15.0
+_file_event_queues: list[queue.Queue] = []
+_file_event_lock = threading.Lock()
+
+
+def publish_file_event(event: dict) -> None:
+    """Send a file change event to every /api/files/events subscriber."""
+    with _file_event_lock:
+        subscribers = list(_file_event_queues)
+    for q in subscribers:
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            # Client fell behind; drop it so it reconnects and resyncs
+            with _file_event_lock:
+                if q in _file_event_queues:
+                    _file_event_queues.remove(q)
+
+
+@app.route("/api/files/events")
+def api_files_events():
+    """
+    Stream file changes as Server-Sent Events.
+
+    Used by RemoteFileService instead of polling /api/files/list.
+
+    Events:
+        {"type": "created", "image": ImageInfo}
+        {"type": "deleted", "filename": str}
+    """
+    q = queue.Queue(maxsize=FILE_EVENT_QUEUE_SIZE)
+    with _file_event_lock:
+        _file_event_queues.append(q)
+
+    def generate():
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = q.get(timeout=FILE_EVENT_KEEPALIVE)
+                except queue.Empty:
+                    with _file_event_lock:
+                        if q not in _file_event_queues:
+                            return
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            with _file_event_lock:
+                if q in _file_event_queues:
+                    _file_event_queues.remove(q)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.route("/api/files/image/<path:filename>")
@@ -352,6 +462,10 @@ def api_files_image(filename):
 
     content_type = file_service.get_content_type(filename)
 
+    local_path = file_service.get_image_path(filename)
+    if local_path:
+        return send_file(local_path, mimetype=content_type)
+
     def generate():
         for chunk in file_service.stream_image(filename):
             yield chunk
@@ -359,6 +473,52 @@ def api_files_image(filename):
     return Response(generate(), mimetype=content_type)
 
 
+# Max filenames accepted by one /api/files/batch request
+FILE_BATCH_LIMIT = 64
+
+
+@app.route("/api/files/batch", methods=["POST"])
+def api_files_batch():
+    """
+    Fetch several images in one request (used by RemoteFileService).
+
+    Body:
+        {"filenames": [str...]}
+
+    Returns:
+        multipart/mixed body, one part per filename with X-Filename
+        (percent-encoded) and Content-Length headers; missing files get an
+        empty part with X-Status: 404.
+    """
+    data = request.get_json(silent=True) or {}
+    filenames = data.get("filenames")
+    if not isinstance(filenames, list) or not all(isinstance(f, str) for f in filenames):
+        return jsonify({"error": "filenames must be a list of strings"}), 400
+    if len(filenames) > FILE_BATCH_LIMIT:
+        return jsonify({"error": f"At most {FILE_BATCH_LIMIT} filenames per batch"}), 400
+
+    boundary = uuid.uuid4().hex
+
+    def generate():
+        for filename in filenames:
+            content = file_service.get_image(filename)
+            headers = [f"X-Filename: {quote(filename)}"]
+            if content is None:
+                headers += ["X-Status: 404", "Content-Length: 0"]
+                content = b""
+            else:
+                headers += [
+                    f"Content-Type: {file_service.get_content_type(filename)}",
+                    f"Content-Length: {len(content)}",
+                ]
+            yield ("\r\n".join([f"--{boundary}", *headers]) + "\r\n\r\n").encode("latin-1")
+            yield content
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("latin-1")
+
+    return Response(generate(), mimetype=f"multipart/mixed; boundary={boundary}")
+
+
 @app.route("/api/files/info/<path:filename>")
 def api_files_info(filename):
     """
@@ -443,7 +603,7 @@ def api_registration_cleanup():
 
     if result["deleted"] > 0:
         # Refresh the image list for connected clients
-        registrations, total = store.get_all(0, 50)
+        registrations, total = store.get_all(0, 50, include_data=False)
         state.set_images(registrations, total)
 
     return jsonify(result)
@@ -785,10 +945,11 @@ def api_images():
     """Get paginated list of registrations (images with associated data)."""
     offset = int(request.args.get("offset", 0))
     limit = int(request.args.get("limit", 50))
+    before_ns = request.args.get("before_ns", type=int)
 
     # Use registration store for unified timeline
     store = get_store()
-    registrations, total = store.get_all(offset, limit)
+    registrations, total = store.get_all(offset, limit, before_ns=before_ns)
 
     # Apply display field mapping (title/data slots from config)
     registrations = map_display_fields_list(registrations)
@@ -984,7 +1145,7 @@ def api_generate():
         return jsonify({"error": "Template not found"}), 404
     except Exception as e:
         log.error(f"Generation failed: {e}")
-        emit("error.handled", {"error_type": type(e).__name__, "message": str(e), "context": "generation"})
+        emit("error.handled", {"error_type": type(e).__name__, "message": str(e), "context": "generation"}, flush=True)
         state.cancel_generation()
         return jsonify({"error": str(e)}), 500
 
@@ -1010,7 +1171,7 @@ def api_conduit_status():
 
     # Check if Conduit is reachable by hitting the workflows endpoint
     try:
-        response = requests.get(
+        response = comfy.session.get(
             f"{CONFIG['comfy_host']}/conduit/workflows",
             timeout=5
         )
@@ -1037,7 +1198,7 @@ def api_conduit_workflows():
     """
     import requests
     try:
-        response = requests.get(
+        response = comfy.session.get(
             f"{CONFIG['comfy_host']}/conduit/workflows",
             timeout=10
         )
@@ -1060,7 +1221,7 @@ def api_conduit_workflow_schema(workflow_name):
     """
     import requests
     try:
-        response = requests.get(
+        response = comfy.session.get(
             f"{CONFIG['comfy_host']}/conduit/workflows/{workflow_name}",
             timeout=10
         )
@@ -1086,7 +1247,7 @@ def api_conduit_workflow_inputs(workflow_name):
         url = f"{CONFIG['comfy_host']}/conduit/workflows/{workflow_name}/inputs"
         if request.args.get('refresh'):
             url += "?refresh=true"
-        response = requests.get(url, timeout=10)
+        response = comfy.session.get(url, timeout=10)
         return jsonify(response.json()), response.status_code
     except requests.RequestException as e:
         log.error(f"Failed to fetch workflow inputs for {workflow_name}: {e}")
@@ -1114,7 +1275,6 @@ def api_conduit_run(workflow_name):
     Uses wait=true so the Conduit handler runs and publishes to Redis,
     which triggers image registration in comfy-viewer.
     """
-    import requests
     import threading
 
     data = request.get_json() or {}
@@ -1129,7 +1289,7 @@ def api_conduit_run(workflow_name):
         try:
             for i in range(count):
                 # Call with wait=true so handler runs and publishes to Redis
-                res = requests.post(
+                res = comfy.session.post(
                     f"{CONFIG['comfy_host']}/conduit/run/{workflow_name}",
                     json={
                         "inputs": inputs,
@@ -1357,12 +1517,17 @@ def api_conduit_event():
 
     if reg:
         # Notify connected WebSocket clients about new image
-        if filepath.exists():
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            st = None
+            log.warning(f"Conduit: registered image missing on disk: {filepath}")
+        if st is not None:
             # Apply display field mapping for title/data slots
             mapped_reg = map_display_fields(reg)
             state.add_image({
                 "filename": relative_path,
-                "size": filepath.stat().st_size,
+                "size": st.st_size,
                 "modified": int(reg["created_at"]),
                 "id": reg["id"],
                 "char_str": reg.get("char_str"),
@@ -1371,8 +1536,9 @@ def api_conduit_event():
                 "tag_name": selected_tag,
             })
             image_count += 1
-            log.info(f"Conduit: registered {relative_path} "
-                     f"(tag={selected_tag}, title={mapped_reg.get('title', {}).get('value')})")
+            if log.isEnabledFor(logging.INFO):
+                log.info("Conduit: registered %s (tag=%s, title=%s)",
+                         relative_path, selected_tag, mapped_reg.get("title", {}).get("value"))
             emit("artifact.created", {
                 "file_path": str(filepath.resolve()),
                 "file_type": filepath.suffix.lstrip("."),
@@ -1412,9 +1578,11 @@ def on_new_image_from_service(filename: str, image_info):
         filename: Image filename (relative to output dir)
         image_info: ImageInfo object from the file service
     """
+    publish_file_event({"type": "created", "image": image_info.to_dict()})
+
     # Skip if this is in the conduit subfolder (handled by conduit-event endpoint)
     if filename.startswith("conduit/") or "/conduit/" in filename:
-        log.debug(f"Skipping conduit image (registered via API): {filename}")
+        log.debug("Skipping conduit image (registered via API): %s", filename)
         return
 
     log.info(f"New image detected by file service: {filename}")
@@ -1456,6 +1624,7 @@ def on_deleted_image_from_service(filename: str):
     Removes the registration from the database and notifies connected clients.
     """
     log.info(f"Image deleted: {filename}")
+    publish_file_event({"type": "deleted", "filename": filename})
 
     # Remove from registration store
     store = get_store()
@@ -1463,7 +1632,7 @@ def on_deleted_image_from_service(filename: str):
 
     if deleted:
         # Notify connected clients by refreshing the image list
-        registrations, total = store.get_all(0, 50)
+        registrations, total = store.get_all(0, 50, include_data=False)
         state.set_images(registrations, total)
 
 
@@ -1548,7 +1717,7 @@ def initialize():
             log.info(f"Registered {new_images} new images from disk scan")
 
     # Load registrations for initial state
-    registrations, total = store.get_all(0, 50)
+    registrations, total = store.get_all(0, 50, include_data=False)
     state.set_images(registrations, total)
 
     # Check ComfyUI connection
@@ -1564,13 +1733,15 @@ def initialize():
     )
 
     # Run lifecycle startup hooks (hooks.local/ can inject transport like Redis)
+    # in the background so a slow connect does not hold up startup
     if file_service.get_backend_type() == "local":
-        from comfy_viewer_hooks import run_lifecycle
-        run_lifecycle("startup", {
+        load_hooks().run_lifecycle("startup", {
             "output_dir": OUTPUT_DIR,
             "register": store.register,
             "add_image": state.add_image,
-        })
+            # For transports that drain a backlog of events at once
+            "add_images": state.add_images_batch,
+        }, background=True)
 
     backend_type = file_service.get_backend_type()
     log.info(f"Initialized with {len(templates)} templates, {total} images")
@@ -1584,8 +1755,7 @@ def initialize():
 def shutdown():
     """Clean shutdown."""
     log.info("Shutting down...")
-    from comfy_viewer_hooks import shutdown_lifecycle
-    shutdown_lifecycle()
+    load_hooks().shutdown_lifecycle()
     file_service.stop_watching()
     comfy.disconnect_websocket()
 
@@ -9,7 +9,6 @@ Two modes of communication:
 import json
 import logging
 import threading
-import time
 from typing import Any, Callable, Optional
 from urllib.parse import urljoin
 
@@ -18,8 +17,17 @@ import websocket
 
 from .state import get_state_manager
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
 log = logging.getLogger("comfy-viewer.comfy_client")
 
+# Progress messages arrive per sampler step; orjson parses them faster
+# (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 class ComfyClient:
     """
@@ -35,10 +43,14 @@ class ComfyClient:
         self._ws: Optional[websocket.WebSocketApp] = None
         self._ws_thread: Optional[threading.Thread] = None
         self._running = False
+        self._stop_event = threading.Event()  # wakes reconnect backoff on shutdown
         self._reconnect_delay = 1.0
         self._max_reconnect_delay = 30.0
         self._state = get_state_manager()
 
+        # Shared HTTP session: keeps connections to ComfyUI alive across calls
+        self.session = requests.Session()
+
         # Track which prompt_ids we're watching
         self._watched_prompts: set[str] = set()
 
@@ -49,7 +61,7 @@ class ComfyClient:
     def health_check(self) -> bool:
         """Check if ComfyUI is reachable."""
         try:
-            response = requests.get(f"{self.host}/system_stats", timeout=5)
+            response = self.session.get(f"{self.host}/system_stats", timeout=5)
             connected = response.status_code == 200
             self._state.set_comfy_connected(connected)
             return connected
@@ -74,7 +86,7 @@ class ComfyClient:
             payload["client_id"] = client_id
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.host}/prompt",
                 json=payload,
                 timeout=30
@@ -95,7 +107,7 @@ class ComfyClient:
     def get_history(self, prompt_id: str) -> Optional[dict]:
         """Get execution history for a prompt."""
         try:
-            response = requests.get(f"{self.host}/history/{prompt_id}", timeout=10)
+            response = self.session.get(f"{self.host}/history/{prompt_id}", timeout=10)
             if response.status_code == 200:
                 return response.json()
             return None
@@ -106,7 +118,7 @@ class ComfyClient:
     def get_queue(self) -> dict:
         """Get current queue status."""
         try:
-            response = requests.get(f"{self.host}/queue", timeout=10)
+            response = self.session.get(f"{self.host}/queue", timeout=10)
             return response.json()
         except Exception as e:
             log.error(f"Failed to get queue: {e}")
@@ -122,6 +134,7 @@ class ComfyClient:
             return
 
         self._running = True
+        self._stop_event.clear()
         self._ws_thread = threading.Thread(target=self._ws_loop, daemon=True)
         self._ws_thread.start()
         log.info("WebSocket connection thread started")
@@ -129,6 +142,7 @@ class ComfyClient:
     def disconnect_websocket(self):
         """Stop WebSocket connection."""
         self._running = False
+        self._stop_event.set()
         if self._ws:
             self._ws.close()
         if self._ws_thread:
@@ -157,13 +171,13 @@ class ComfyClient:
                 # If we get here, connection closed
                 if self._running:
                     log.warning(f"WebSocket closed, reconnecting in {delay}s...")
-                    time.sleep(delay)
+                    self._stop_event.wait(delay)
                     delay = min(delay * 2, self._max_reconnect_delay)
 
             except Exception as e:
                 log.error(f"WebSocket error: {e}")
                 if self._running:
-                    time.sleep(delay)
+                    self._stop_event.wait(delay)
                     delay = min(delay * 2, self._max_reconnect_delay)
 
     def _on_ws_open(self, ws):
@@ -175,13 +189,13 @@ class ComfyClient:
     def _on_ws_message(self, ws, message):
         """Handle incoming WebSocket messages from ComfyUI."""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             msg_type = data.get("type")
 
             if msg_type == "status":
                 # Queue status update
                 queue_info = data.get("data", {}).get("status", {}).get("exec_info", {})
-                log.debug(f"Queue status: {queue_info}")
+                log.debug("Queue status: %s", queue_info)
 
             elif msg_type == "execution_start":
                 prompt_id = data.get("data", {}).get("prompt_id")
@@ -199,7 +213,7 @@ class ComfyClient:
                         self._watched_prompts.discard(prompt_id)
                         self._state.complete_generation(prompt_id)
                     else:
-                        log.debug(f"Executing node {node} for {prompt_id}")
+                        log.debug("Executing node %s for %s", node, prompt_id)
 
             elif msg_type == "progress":
                 prompt_id = data.get("data", {}).get("prompt_id")
@@ -212,8 +226,8 @@ class ComfyClient:
             elif msg_type == "executed":
                 prompt_id = data.get("data", {}).get("prompt_id")
                 output = data.get("data", {}).get("output", {})
-                if prompt_id in self._watched_prompts:
-                    log.debug(f"Node executed for {prompt_id}: {list(output.keys())}")
+                if prompt_id in self._watched_prompts and log.isEnabledFor(logging.DEBUG):
+                    log.debug("Node executed for %s: %s", prompt_id, list(output.keys()))
 
         except json.JSONDecodeError:
             log.warning(f"Invalid JSON from WebSocket: {message[:100]}")
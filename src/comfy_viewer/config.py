@@ -1,7 +1,7 @@
 """Configuration helpers for comfy-viewer."""
 
-import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Any
 
@@ -36,6 +36,7 @@ DEFAULT_CONFIG = {
     "remote_url": None,
     "poll_interval": 2.0,
     "hooks_dir": str(CONFIG_DIR / "hooks"),
+    "async_mode": "threading",
     "display": DEFAULT_DISPLAY,
 }
 
@@ -71,11 +72,21 @@ def resolve_config_path(config_path: Optional[Path] = None) -> Path:
     return DEFAULT_CONFIG_PATH
 
 
+# libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def _load_config_file(path: Path, strict: bool = False) -> dict:
-    if not path.exists():
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return {}
+    except OSError as exc:
+        if strict:
+            raise ValueError(f"Failed to read config file {path}: {exc}")
         return {}
     try:
-        data = yaml.safe_load(path.read_text()) or {}
+        data = yaml.load(raw, Loader=_YamlLoader) or {}
     except Exception as exc:
         if strict:
             raise ValueError(f"Failed to parse config file {path}: {exc}")
@@ -92,22 +103,41 @@ def read_config_file(config_path: Optional[Path] = None, strict: bool = False) -
     return _load_config_file(path, strict=strict)
 
 
+def _clone(value: Any) -> Any:
+    """Copy nested dicts/lists; other config values are immutable scalars."""
+    if isinstance(value, dict):
+        return {key: _clone(item) if isinstance(item, (dict, list)) else item
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) if isinstance(item, (dict, list)) else item
+                for item in value]
+    return value
+
+
 def _deep_merge(base: dict, update: dict) -> dict:
-    merged = copy.deepcopy(base)
-    for key, value in update.items():
-        if isinstance(value, dict) and isinstance(merged.get(key), dict):
-            merged[key] = _deep_merge(merged[key], value)
-        else:
-            merged[key] = value
+    merged = _clone(base)
+    # Walk nested dicts with an explicit stack; merged is already a private
+    # copy, so nested levels are updated in place.
+    stack = [(merged, update)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                stack.append((current, value))
+            else:
+                target[key] = value
     return merged
 
 
 def config_defaults() -> dict:
-    return copy.deepcopy(DEFAULT_CONFIG)
+    return _clone(DEFAULT_CONFIG)
 
 
-def _apply_env_overrides(config: dict) -> dict:
-    mapping = {
+# Full environment variable name -> (config key, cast)
+_ENV_OVERRIDES = {
+    f"{ENV_PREFIX}_{env_name}": spec
+    for env_name, spec in {
         "HOST": ("host", str),
         "PORT": ("port", int),
         "COMFY_HOST": ("comfy_host", str),
@@ -121,10 +151,15 @@ def _apply_env_overrides(config: dict) -> dict:
         "REMOTE_URL": ("remote_url", str),
         "POLL_INTERVAL": ("poll_interval", float),
         "HOOKS_DIR": ("hooks_dir", str),
-    }
+        "ASYNC_MODE": ("async_mode", str),
+    }.items()
+}
 
-    for env_name, (key, cast) in mapping.items():
-        value = _env(env_name)
+
+def _apply_env_overrides(config: dict) -> dict:
+    environ = os.environ
+    for env_name, (key, cast) in _ENV_OVERRIDES.items():
+        value = environ.get(env_name)
         if value is None:
             continue
         if cast == "bool":
@@ -138,16 +173,21 @@ def _apply_env_overrides(config: dict) -> dict:
     return config
 
 
+@lru_cache(maxsize=64)
+def _resolve_path(value: str, root: Path) -> str:
+    path = Path(value).expanduser()
+    if not path.is_absolute():
+        path = root / path
+    return str(path)
+
+
 def _resolve_paths(config: dict, base_dir: Path) -> dict:
     for key in PATH_KEYS:
         value = config.get(key)
         if not value:
             continue
-        path = Path(str(value)).expanduser()
-        if not path.is_absolute():
-            root = PACKAGE_DIR if key == "templates_dir" else base_dir
-            path = root / path
-        config[key] = str(path)
+        root = PACKAGE_DIR if key == "templates_dir" else base_dir
+        config[key] = _resolve_path(str(value), root)
     return config
 
 
@@ -190,121 +230,170 @@ def write_config(config: dict, config_path: Optional[Path] = None) -> Path:
     return path
 
 
-def config_schema() -> dict:
-    return {
-        "$schema": "https://json-schema.org/draft/2020-12/schema",
-        "type": "object",
-        "properties": {
-            "host": {"type": "string"},
-            "port": {"type": "integer", "minimum": 1, "maximum": 65535},
-            "comfy_host": {"type": "string"},
-            "templates_dir": {"type": "string"},
-            "data_dir": {"type": "string"},
-            "cache_dir": {"type": "string"},
-            "quicksaves_dir": {"type": "string"},
-            "output_dir": {"type": "string"},
-            "randomize_seed": {"type": "boolean"},
-            "file_backend": {"type": "string", "enum": ["local", "remote"]},
-            "remote_url": {"type": ["string", "null"]},
-            "poll_interval": {"type": "number", "minimum": 0},
-            "hooks_dir": {"type": ["string", "null"]},
-            "display": {
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "object",
-                        "properties": {
-                            "field": {"type": "string"},
-                            "label": {"type": "string"},
-                        },
-                        "required": ["field", "label"],
-                        "additionalProperties": False,
+_CONFIG_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "properties": {
+        "host": {"type": "string"},
+        "port": {"type": "integer", "minimum": 1, "maximum": 65535},
+        "comfy_host": {"type": "string"},
+        "templates_dir": {"type": "string"},
+        "data_dir": {"type": "string"},
+        "cache_dir": {"type": "string"},
+        "quicksaves_dir": {"type": "string"},
+        "output_dir": {"type": "string"},
+        "randomize_seed": {"type": "boolean"},
+        "file_backend": {"type": "string", "enum": ["local", "remote"]},
+        "remote_url": {"type": ["string", "null"]},
+        "poll_interval": {"type": "number", "minimum": 0},
+        "hooks_dir": {"type": ["string", "null"]},
+        "async_mode": {"type": "string", "enum": ["threading", "eventlet", "gevent", "gevent_uwsgi"]},
+        "display": {
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "object",
+                    "properties": {
+                        "field": {"type": "string"},
+                        "label": {"type": "string"},
                     },
-                    "data": {
-                        "type": "object",
-                        "properties": {
-                            "field": {"type": "string"},
-                            "label": {"type": "string"},
-                        },
-                        "required": ["field", "label"],
-                        "additionalProperties": False,
+                    "required": ["field", "label"],
+                    "additionalProperties": False,
+                },
+                "data": {
+                    "type": "object",
+                    "properties": {
+                        "field": {"type": "string"},
+                        "label": {"type": "string"},
                     },
+                    "required": ["field", "label"],
+                    "additionalProperties": False,
                 },
-                "required": ["title", "data"],
-                "additionalProperties": False,
             },
+            "required": ["title", "data"],
+            "additionalProperties": False,
         },
-        "additionalProperties": False,
-    }
+    },
+    "additionalProperties": False,
+}
+
+
+def config_schema() -> dict:
+    return _clone(_CONFIG_SCHEMA)
 
 
 def _is_int(value: Any) -> bool:
     return isinstance(value, int) and not isinstance(value, bool)
 
 
+# ─────────────────────────────────────────────────────────────
+# Schema-compiled validation
+# ─────────────────────────────────────────────────────────────
+
+# type name -> (check expression on `value`, noun used in error messages)
+_TYPE_CHECKS = {
+    "string": ("isinstance(value, str)", "a string"),
+    "integer": ("_is_int(value)", "an integer"),
+    "number": ("isinstance(value, (int, float))", "a number"),
+    "boolean": ("isinstance(value, bool)", "a boolean"),
+    "object": ("isinstance(value, dict)", "an object"),
+    "null": ("value is None", "null"),
+}
+
+
+def _compile_required(lines: list[str], name: str, spec: dict, var: str, indent: str) -> None:
+    """Emit presence checks for an object's required members, recursively."""
+    props = spec.get("properties", {})
+    for index, field in enumerate(spec.get("required", ())):
+        child = f"{var}_{index}"
+        path = f"{name}.{field}"
+        child_spec = props.get(field, {})
+        lines.append(f"{indent}if {field!r} not in {var}:")
+        lines.append(f"{indent}    append({path + ' is required'!r})")
+        if child_spec.get("type") == "object" and child_spec.get("required"):
+            lines.append(f"{indent}elif not isinstance({var}[{field!r}], dict):")
+            lines.append(f"{indent}    append({path + ' must be an object'!r})")
+            lines.append(f"{indent}else:")
+            lines.append(f"{indent}    {child} = {var}[{field!r}]")
+            _compile_required(lines, path, child_spec, child, indent + "    ")
+
+
+def _compile_property(key: str, spec: dict) -> str:
+    """Generate source for a checker of one top-level property."""
+    lines = [f"def _check_{key}(value, append):"]
+    expected = spec.get("type")
+
+    if isinstance(expected, list):
+        checks = " or ".join(_TYPE_CHECKS[name][0] for name in expected)
+        message = f"{key} must be one of types: {', '.join(expected)}"
+        lines.append(f"    if not ({checks}):")
+        lines.append(f"        append({message!r})")
+        return "\n".join(lines)
+
+    if isinstance(expected, str):
+        check, noun = _TYPE_CHECKS[expected]
+        lines.append(f"    if not {check}:")
+        lines.append(f"        append({f'{key} must be {noun}'!r})")
+
+    if "enum" in spec:
+        options = tuple(spec["enum"])
+        message = f"{key} must be " + " or ".join(repr(option) for option in options)
+        lines.append(f"    if value not in {options!r}:")
+        lines.append(f"        append({message!r})")
+
+    if "minimum" in spec or "maximum" in spec:
+        check = _TYPE_CHECKS[expected][0]
+        low, high = spec.get("minimum"), spec.get("maximum")
+        if low is not None and high is not None:
+            condition = f"not ({low!r} <= value <= {high!r})"
+            message = f"{key} must be between {low} and {high}"
+        elif low is not None:
+            condition = f"value < {low!r}"
+            message = f"{key} must be >= {low}"
+        else:
+            condition = f"value > {high!r}"
+            message = f"{key} must be <= {high}"
+        lines.append(f"    if {check} and {condition}:")
+        lines.append(f"        append({message!r})")
+
+    if expected == "object" and spec.get("required"):
+        lines.append("    if isinstance(value, dict):")
+        _compile_required(lines, key, spec, "value", "        ")
+
+    if len(lines) == 1:
+        lines.append("    pass")
+    return "\n".join(lines)
+
+
+def _compile_validator(schema: dict) -> dict:
+    """Build {key: checker} from the schema's top-level properties."""
+    props = schema.get("properties", {})
+    source = "\n\n".join(_compile_property(key, spec) for key, spec in props.items())
+    namespace = {"_is_int": _is_int}
+    exec(compile(source, "<config-validator>", "exec"), namespace)
+    return {key: namespace[f"_check_{key}"] for key in props}
+
+
+_PROPERTY_CHECKS = _compile_validator(_CONFIG_SCHEMA)
+
+
 def validate_config_dict(data: Any) -> list[str]:
-    errors: list[str] = []
     if not isinstance(data, dict):
         return ["Config must be a mapping/object"]
 
-    schema = config_schema()
-    props = schema.get("properties", {})
-    allowed_keys = set(props.keys())
-
-    for key in data.keys():
-        if key not in allowed_keys:
-            errors.append(f"Unknown config key: {key}")
-
-    def check_type(key: str, value: Any, expected: str) -> None:
-        if expected == "string" and not isinstance(value, str):
-            errors.append(f"{key} must be a string")
-        elif expected == "integer" and not _is_int(value):
-            errors.append(f"{key} must be an integer")
-        elif expected == "number" and not isinstance(value, (int, float)):
-            errors.append(f"{key} must be a number")
-        elif expected == "boolean" and not isinstance(value, bool):
-            errors.append(f"{key} must be a boolean")
-        elif expected == "object" and not isinstance(value, dict):
-            errors.append(f"{key} must be an object")
-
+    checks = _PROPERTY_CHECKS
+    errors: list[str] = [
+        f"Unknown config key: {key}" for key in data if key not in checks
+    ]
+    append = errors.append
     for key, value in data.items():
-        if key not in props:
-            continue
-        spec = props[key]
-        expected = spec.get("type")
-        if isinstance(expected, list):
-            if value is None and "null" in expected:
-                continue
-            if "string" in expected and isinstance(value, str):
-                continue
-            errors.append(f"{key} must be one of types: {', '.join(expected)}")
-            continue
-        if isinstance(expected, str):
-            check_type(key, value, expected)
-
-        if key == "file_backend" and value not in {"local", "remote"}:
-            errors.append("file_backend must be 'local' or 'remote'")
-        if key == "port" and _is_int(value) and not (1 <= value <= 65535):
-            errors.append("port must be between 1 and 65535")
-        if key == "poll_interval" and isinstance(value, (int, float)) and value < 0:
-            errors.append("poll_interval must be >= 0")
-        if key == "display" and isinstance(value, dict):
-            for field in ("title", "data"):
-                if field not in value:
-                    errors.append(f"display.{field} is required")
-                elif not isinstance(value[field], dict):
-                    errors.append(f"display.{field} must be an object")
-                else:
-                    for nested in ("field", "label"):
-                        if nested not in value[field]:
-                            errors.append(f"display.{field}.{nested} is required")
-
+        check = checks.get(key)
+        if check is not None:
+            check(value, append)
     return errors
 
 
 def validate_config_file(config_path: Optional[Path] = None) -> list[str]:
     path = resolve_config_path(config_path)
-    if not path.exists():
-        return []
     data = _load_config_file(path, strict=True)
     return validate_config_dict(data)
@@ -4,27 +4,54 @@ Structured event emitter.
 Default: JSON lines to stderr (captured by journald, pipeable).
 Extensible: call add_handler() to add Redis, database, or custom transports.
 
-This file is vendored per-package. It has NO external dependencies.
+This file is vendored per-package. It has NO required dependencies;
+orjson is used for serialization when installed.
 
 Event format:
     {"event_type": "...", "timestamp": "...", "source": {"tool": "..."}, "data": {...}}
 
 Events are always single-line JSON on stderr, distinguishable from log lines.
+Lines are buffered and written in batches, at most ~100ms after they are
+emitted; call flush() (or pass flush=True) when an event must reach stderr
+before subsequent log output.
 """
 
+import atexit
 import json
 import sys
 import logging
+import threading
+import time
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 EventHandler = Callable[[dict], None]
 
-_handlers: List[EventHandler] = []
+# Rebuilt (never mutated) on add/remove so emit() can iterate without a lock
+_handlers: Tuple[EventHandler, ...] = ()
 _source: str = "unknown"
 
+# Pending stderr output, written once it exceeds _BUFFER_LIMIT bytes or
+# the oldest line has waited _FLUSH_INTERVAL seconds
+_BUFFER_LIMIT = 4096
+_FLUSH_INTERVAL = 0.1
+_buffer = bytearray()
+_buffer_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+_UTC = timezone.utc
+_now = time.time
+# (whole second, formatted "YYYY-MM-DDTHH:MM:SS") for the last emitted second
+_timestamp_cache: tuple = (None, "")
+
 
 def configure(source: str) -> None:
     """Set the source name for emitted events. Call once at startup."""
@@ -34,50 +61,144 @@ def configure(source: str) -> None:
 
 def add_handler(handler: EventHandler) -> None:
     """Register an additional event handler (e.g., Redis transport)."""
-    _handlers.append(handler)
+    global _handlers
+    _handlers = _handlers + (handler,)
 
 
 def remove_handler(handler: EventHandler) -> None:
     """Remove a previously registered handler."""
+    global _handlers
     if handler in _handlers:
-        _handlers.remove(handler)
+        index = _handlers.index(handler)
+        _handlers = _handlers[:index] + _handlers[index + 1:]
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an event to compact JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib handles those
+    return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _line_template(event_type: str, tool: str) -> tuple:
+    """
+    Pre-serialized JSON around the per-event parts of a stderr line.
+
+    A line is head + timestamp + middle + data + b"}", byte-identical to
+    serializing the whole event dict.
+    """
+    head = b'{"event_type":' + _dumps(event_type) + b',"timestamp":"'
+    middle = b'","source":' + _dumps({"tool": tool}) + b',"data":'
+    return head, middle
+
+
+def _timestamp() -> str:
+    """Current UTC time in ISO 8601 format, reusing the per-second prefix."""
+    global _timestamp_cache
+    now = _now()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if cached_second != second:
+        prefix = datetime.fromtimestamp(second, _UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1e6):06d}+00:00"
+
+
+def _write_buffer() -> None:
+    """Write pending lines to stderr. Caller must hold _buffer_lock."""
+    global _flush_timer
+    if _flush_timer is not None:
+        _flush_timer.cancel()
+        _flush_timer = None
+    if not _buffer:
+        return
+    payload = bytes(_buffer)
+    _buffer.clear()
+
+    stream = getattr(sys.stderr, "buffer", None)
+    if stream is not None:
+        stream.write(payload)
+        stream.flush()
+    else:
+        # stderr replaced by a text-only stream (e.g. captured in tests)
+        sys.stderr.write(payload.decode("utf-8"))
+        sys.stderr.flush()
+
+
+def flush() -> None:
+    """Write any buffered events to stderr."""
+    with _buffer_lock:
+        try:
+            _write_buffer()
+        except Exception:
+            pass
+
+
+atexit.register(flush)
+
+
+def _schedule_flush() -> None:
+    """Bound how long a line can wait. Caller must hold _buffer_lock."""
+    global _flush_timer
+    _flush_timer = threading.Timer(_FLUSH_INTERVAL, flush)
+    _flush_timer.daemon = True
+    _flush_timer.start()
 
 
 def emit(
     event_type: str,
     data: Dict[str, Any],
     source: Optional[str] = None,
+    flush: bool = False,
 ) -> None:
     """
     Emit a structured event.
 
-    Default: writes one JSON line to stderr.
+    Default: buffers one JSON line for stderr.
     Additional handlers receive the same event dict.
 
     Args:
         event_type: Event type (e.g., "operation.completed")
         data: Event payload
         source: Override source name for this event
+        flush: Write buffered events to stderr immediately
     """
-    event = {
-        "event_type": event_type,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "source": {
-            "tool": source or _source,
-        },
-        "data": data,
-    }
+    handlers = _handlers
+    tool = source or _source
+    timestamp = _timestamp()
 
     # Default: structured JSON to stderr (one line per event)
     try:
-        line = json.dumps(event, default=str)
-        print(line, file=sys.stderr, flush=True)
+        head, middle = _line_template(event_type, tool)
+        body = _dumps(data)
+        buffer = _buffer
+        with _buffer_lock:
+            buffer += head
+            buffer += timestamp.encode("ascii")
+            buffer += middle
+            buffer += body
+            buffer += b"}\n"
+            if flush or len(buffer) >= _BUFFER_LIMIT:
+                _write_buffer()
+            elif _flush_timer is None:
+                _schedule_flush()
     except Exception:
         pass
 
     # Additional handlers (added via add_handler() at startup)
-    for handler in _handlers:
-        try:
-            handler(event)
-        except Exception as exc:
-            logger.debug("Event handler error: %s", exc)
+    if handlers:
+        event = {
+            "event_type": event_type,
+            "timestamp": timestamp,
+            "source": {"tool": tool},
+            "data": data,
+        }
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as exc:
+                logger.debug("Event handler error: %s", exc)
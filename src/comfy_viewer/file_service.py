@@ -21,23 +21,65 @@ Usage:
         yield chunk
 """
 
+import atexit
 import hashlib
+import heapq
 import io
 import json
 import logging
 import os
+import stat as stat_module
+import struct
+import sys
 import threading
 import time
+import zlib
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterator, Optional, Callable, Any
+from typing import BinaryIO, Iterator, Optional, Callable, Any
 from datetime import datetime
+from urllib.parse import unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 
 log = logging.getLogger("comfy-viewer.file_service")
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Default stream_image chunk size; small reads dominate cost below ~100 KiB
+STREAM_CHUNK_SIZE = 131072
+
+
+def _io_thread_count() -> int:
+    value = os.environ.get("COMFY_VIEWER_IO_THREADS")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            log.warning(f"Ignoring invalid COMFY_VIEWER_IO_THREADS: {value}")
+    return 16
+
+
+# Shared by every FileService for metadata fan-out and bulk copies, so
+# running several services in one process doesn't multiply threads.
+# Workers start lazily on first submit.
+_GLOBAL_IO_POOL = ThreadPoolExecutor(
+    max_workers=_io_thread_count(),
+    thread_name_prefix="comfy-io",
+)
+atexit.register(_GLOBAL_IO_POOL.shutdown)
 
 # ─────────────────────────────────────────────────────────────
 # Data Classes
@@ -120,7 +162,7 @@ class FileService(ABC):
         pass
 
     @abstractmethod
-    def stream_image(self, filename: str, chunk_size: int = 8192) -> Iterator[bytes]:
+    def stream_image(self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
         """
         Stream image content in chunks.
 
@@ -175,6 +217,25 @@ class FileService(ABC):
         """
         pass
 
+    def copy_images(self, filenames: list[str], destination_dir: Path) -> dict[str, bool]:
+        """
+        Copy several images into a local directory concurrently.
+
+        Args:
+            filenames: Source image filenames
+            destination_dir: Directory to copy into (keeps each file's name)
+
+        Returns:
+            Mapping of filename to copy_image() result
+        """
+        if not filenames:
+            return {}
+        results = _GLOBAL_IO_POOL.map(
+            lambda name: self.copy_image(name, destination_dir / Path(name).name),
+            filenames,
+        )
+        return dict(zip(filenames, results))
+
     @abstractmethod
     def watch_changes(
         self,
@@ -265,10 +326,184 @@ class FileService(ABC):
         pass
 
 
+# ─────────────────────────────────────────────────────────────
+# Image Header Parsing
+# ─────────────────────────────────────────────────────────────
+
+# Bytes read from the start of a file when parsing headers
+HEADER_READ_SIZE = 65536
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (excluding DHT/JPG/DAC, which share the range)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _parse_png_header(f: BinaryIO) -> Optional[tuple[int, int, str, dict]]:
+    """
+    Read IHDR dimensions and text chunks, streaming chunk by chunk.
+
+    ComfyUI writes its tEXt chunks ahead of the image data, so reading stops
+    at the first IDAT instead of pulling the whole file through.
+    """
+    head = f.read(24)
+    if len(head) < 24 or head[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", head[16:24])
+    f.seek(8)
+
+    text = {}
+    while True:
+        chunk_head = f.read(8)
+        if len(chunk_head) < 8:
+            return None  # truncated before any image data
+        length, ctype = struct.unpack(">I4s", chunk_head)
+        if ctype in (b"IDAT", b"IEND"):
+            return width, height, "PNG", text
+        if ctype not in (b"tEXt", b"iTXt", b"zTXt"):
+            f.seek(length + 4, os.SEEK_CUR)  # skip body and CRC
+            continue
+        data = f.read(length)
+        if len(data) < length:
+            return None
+        f.seek(4, os.SEEK_CUR)  # CRC
+        keyword, sep, value = data.partition(b"\x00")
+        if not sep:
+            return None
+        key = keyword.decode("latin-1")
+        if ctype == b"tEXt":
+            text[key] = value.decode("latin-1")
+        elif ctype == b"zTXt":
+            # value[0] is the compression method; 0 (zlib) is the only one defined
+            text[key] = zlib.decompress(value[1:]).decode("latin-1")
+        else:
+            compressed = value[:1] == b"\x01"
+            _lang, _, rest = value[2:].partition(b"\x00")
+            _translated, _, body = rest.partition(b"\x00")
+            if compressed:
+                body = zlib.decompress(body)
+            text[key] = body.decode("utf-8")
+
+
+def _parse_jpeg_header(head: bytes) -> Optional[tuple[int, int, str, dict]]:
+    """Scan JPEG markers for the start-of-frame dimensions."""
+    offset = 2
+    size = len(head)
+    while offset + 4 <= size:
+        if head[offset] != 0xFF:
+            return None
+        marker = head[offset + 1]
+        if marker == 0xFF:
+            offset += 1  # fill byte
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+        length = struct.unpack(">H", head[offset + 2:offset + 4])[0]
+        if marker == 0xE2 and head[offset + 4:offset + 8] == b"MPF\x00":
+            return None  # multi-picture files are reported as MPO by PIL
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > size:
+                return None
+            height, width = struct.unpack(">HH", head[offset + 5:offset + 9])
+            return width, height, "JPEG", {}
+        if marker in (0xD9, 0xDA):
+            return None
+        offset += 2 + length
+    return None
+
+
+def _parse_webp_header(head: bytes) -> Optional[tuple[int, int, str, dict]]:
+    """Read canvas dimensions from the first RIFF chunk of a WebP file."""
+    if len(head) < 30 or head[8:12] != b"WEBP":
+        return None
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF, "WEBP", {}
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, "WEBP", {}
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height, "WEBP", {}
+    return None
+
+
+def _parse_image_header(path: Path) -> Optional[tuple[int, int, str, dict]]:
+    """
+    Get (width, height, format, text chunks) without decoding the image.
+
+    PNGs are scanned chunk by chunk up to the first IDAT; JPEG and WebP are
+    parsed from the first HEADER_READ_SIZE bytes. Returns None when the header
+    can't be fully understood, in which case callers should fall back to PIL.
+    """
+    with open(path, "rb") as f:
+        try:
+            if f.read(8) == _PNG_SIGNATURE:
+                f.seek(0)
+                return _parse_png_header(f)
+            f.seek(0)
+            head = f.read(HEADER_READ_SIZE)
+            if head.startswith(b"\xff\xd8"):
+                return _parse_jpeg_header(head)
+            if head.startswith(b"RIFF"):
+                return _parse_webp_header(head)
+        except (struct.error, zlib.error, UnicodeDecodeError, IndexError):
+            pass
+    return None
+
+
+def _comfy_metadata(text: dict) -> dict:
+    """Extract ComfyUI prompt/workflow/parameters from PNG text chunks."""
+    metadata = {}
+    if 'prompt' in text:
+        try:
+            metadata['prompt'] = json.loads(text['prompt'])
+        except json.JSONDecodeError:
+            metadata['prompt_raw'] = text['prompt']
+    if 'workflow' in text:
+        try:
+            metadata['workflow'] = json.loads(text['workflow'])
+        except json.JSONDecodeError:
+            metadata['workflow_raw'] = text['workflow']
+    if 'parameters' in text:
+        metadata['parameters'] = text['parameters']
+    return metadata
+
+
 # ─────────────────────────────────────────────────────────────
 # Local File Service
 # ─────────────────────────────────────────────────────────────
 
+def _emits_close_events(observer) -> bool:
+    """True if the observer reports IN_CLOSE_WRITE (watchdog's inotify backend)."""
+    try:
+        from watchdog.observers.inotify import InotifyObserver
+    except ImportError:
+        return False
+    return isinstance(observer, InotifyObserver)
+
+
+def _fs_concurrency_limit():
+    """
+    Context manager bounding concurrent file opens.
+
+    APFS serializes opens on a kernel lock, so on macOS heavy fan-out makes
+    every open slower; cap it at ~2/3 of logical cores there. Other platforms
+    are unbounded unless COMFY_VIEWER_FS_CONCURRENCY is set.
+    """
+    value = os.environ.get("COMFY_VIEWER_FS_CONCURRENCY")
+    if value:
+        try:
+            return threading.BoundedSemaphore(max(1, int(value)))
+        except ValueError:
+            log.warning(f"Ignoring invalid COMFY_VIEWER_FS_CONCURRENCY: {value}")
+    if sys.platform == "darwin":
+        return threading.BoundedSemaphore(max(2, (os.cpu_count() or 4) * 2 // 3))
+    return nullcontext()
+
+
 class LocalFileService(FileService):
     """
     File service implementation for local filesystem.
@@ -276,16 +511,50 @@ class LocalFileService(FileService):
     Uses direct file I/O and inotify for change detection.
     """
 
+    # Seconds a directory listing is reused while the directory mtime is unchanged
+    LIST_CACHE_TTL = 1.0
+    # Max parsed ImageInfo entries kept across listings
+    INFO_CACHE_SIZE = 4096
+    # Files per metadata task submitted to the I/O pool
+    INFO_BATCH_SIZE = 32
+    # Threads processing new files from the watcher
+    WATCH_WORKERS = 4
+
     def __init__(self, output_dir: Path, templates_dir: Optional[Path] = None):
         self.output_dir = Path(output_dir)
         self.templates_dir = Path(templates_dir) if templates_dir else None
         self._observer = None
+        self._handler = None
+        self._watch_pool: Optional[ThreadPoolExecutor] = None
         self._watching = False
         self._on_created = None
         self._on_deleted = None
 
+        # subdirectory -> (dir st_mtime_ns, monotonic time, sorted images)
+        self._list_cache: dict[str, tuple[int, float, list[ImageInfo]]] = {}
+        self._list_cache_lock = threading.Lock()
+
+        # (path, st_mtime_ns, st_size) -> ImageInfo, least recently used first
+        self._info_cache: OrderedDict[tuple[str, int, int], ImageInfo] = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+
+        # str(path) -> (st_mtime_ns, raw bytes) for template JSON files.
+        # Bytes rather than parsed objects: callers mutate what they get back.
+        self._tpl_cache: dict[str, tuple[int, bytes]] = {}
+        # template -> (settings path, graph path) as plain strings
+        self._tpl_paths: dict[str, tuple[str, str]] = {}
+
+        self._fs_limit = _fs_concurrency_limit()
+
+        # Parallel stat + header reads for list_images and bulk copies. New
+        # files from the watcher go to _watch_pool instead: settling them
+        # can sleep for seconds and must not stall listings.
+        self._io_pool = _GLOBAL_IO_POOL
+
         # Ensure directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Resolved once; _safe_path checks every request against it
+        self._output_root = self.output_dir.resolve()
 
         log.info(f"LocalFileService initialized: {self.output_dir}")
         if self.templates_dir:
@@ -293,52 +562,105 @@ class LocalFileService(FileService):
 
     def _safe_path(self, filename: str) -> Optional[Path]:
         """Resolve filename and ensure it stays within output_dir."""
-        path = (self.output_dir / filename).resolve()
-        if not path.is_relative_to(self.output_dir.resolve()):
+        path = (self._output_root / filename).resolve()
+        if not path.is_relative_to(self._output_root):
             log.warning(f"Path traversal attempt blocked: {filename}")
             return None
         return path
 
+    def _invalidate_list_cache(self) -> None:
+        """Drop cached directory listings (called on watcher events)."""
+        with self._list_cache_lock:
+            self._list_cache.clear()
+
     def list_images(self, subdirectory: str = "") -> list[ImageInfo]:
         """List images in the output directory."""
         target_dir = self._safe_path(subdirectory) if subdirectory else self.output_dir
 
-        if target_dir is None or not target_dir.exists():
+        if target_dir is None:
+            return []
+        try:
+            dir_mtime = target_dir.stat().st_mtime_ns
+        except OSError:
             return []
 
-        images = []
-        for path in target_dir.iterdir():
-            if path.is_file() and path.suffix.lower() in self.IMAGE_EXTENSIONS:
-                info = self._get_image_info_from_path(path)
-                if info:
-                    images.append(info)
+        now = time.monotonic()
+        with self._list_cache_lock:
+            cached = self._list_cache.get(subdirectory)
+        if cached and cached[0] == dir_mtime and now - cached[1] < self.LIST_CACHE_TTL:
+            return list(cached[2])
+
+        # DirEntry caches the file type from the directory read, and its
+        # stat() result is handed through so each file is stat'ed once
+        entries = []
+        extensions = self.IMAGE_EXTENSIONS
+        with os.scandir(target_dir) as it:
+            for entry in it:
+                name = entry.name
+                dot = name.rfind(".")
+                if dot < 0 or name[dot:].lower() not in extensions:
+                    continue
+                if entry.is_file():
+                    entries.append(entry)
+        images = self._get_image_infos(entries)
 
         # Sort by modified time, newest first
         images.sort(key=lambda x: x.modified, reverse=True)
-        return images
+
+        with self._list_cache_lock:
+            self._list_cache[subdirectory] = (dir_mtime, now, images)
+        return list(images)
 
     def get_image(self, filename: str) -> Optional[bytes]:
         """Read image file content."""
         path = self._safe_path(filename)
-        if path is None or not path.exists() or not path.is_file():
+        if path is None:
+            return None
+
+        # One open + fstat replaces exists()/is_file()/read_bytes()'s stats,
+        # and the file is read into a buffer of exactly its size
+        try:
+            with self._fs_limit:
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+        except Exception as e:
+            log.error(f"Failed to read image {filename}: {e}")
             return None
 
         try:
-            return path.read_bytes()
+            st = os.fstat(fd)
+            if not stat_module.S_ISREG(st.st_mode):
+                return None
+            data = os.read(fd, st.st_size)
+            if len(data) < st.st_size:
+                # Short read (very large file or still being written)
+                parts = [data]
+                while chunk := os.read(fd, STREAM_CHUNK_SIZE):
+                    parts.append(chunk)
+                data = b"".join(parts)
+            return data
         except Exception as e:
             log.error(f"Failed to read image {filename}: {e}")
             return None
+        finally:
+            os.close(fd)
 
-    def stream_image(self, filename: str, chunk_size: int = 8192) -> Iterator[bytes]:
+    def stream_image(self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
         """Stream image content in chunks."""
         path = self._safe_path(filename)
         if path is None or not path.exists() or not path.is_file():
             return
 
         try:
-            with open(path, "rb") as f:
-                while chunk := f.read(chunk_size):
+            # Unbuffered fd reads: each chunk is already a large read
+            with self._fs_limit:
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                while chunk := os.read(fd, chunk_size):
                     yield chunk
+            finally:
+                os.close(fd)
         except Exception as e:
             log.error(f"Failed to stream image {filename}: {e}")
 
@@ -356,9 +678,9 @@ class LocalFileService(FileService):
         return path is not None and path.exists() and path.is_file()
 
     def get_image_path(self, filename: str) -> Optional[Path]:
-        """Get local path for an image."""
+        """Get local path for an image (regular files only, never directories)."""
         path = self._safe_path(filename)
-        if path is not None and path.exists():
+        if path is not None and path.is_file():
             return path
         return None
 
@@ -397,74 +719,168 @@ class LocalFileService(FileService):
         self._on_deleted = on_deleted
 
         class Handler(FileSystemEventHandler):
-            def __init__(inner_self):
+            DEBOUNCE = 0.5
+
+            def __init__(inner_self, close_events: bool, pool: ThreadPoolExecutor):
                 super().__init__()
+                inner_self._pool = pool
+                # With close-write events a new file is handled once the writer
+                # closes it; otherwise fall back to debounce + size polling
+                inner_self._close_events = close_events
+                # path -> (due time, filepath); the heap may hold stale entries
+                # for paths rescheduled since, which are skipped when popped
                 inner_self._pending = {}
-                inner_self._lock = threading.Lock()
+                inner_self._heap = []
+                # Paths created since their last close-write; a close of any
+                # other path is a rewrite or touch of a known file, not new
+                inner_self._created = set()
+                inner_self._cond = threading.Condition()
+                inner_self._stopped = False
+                inner_self._scheduler = threading.Thread(
+                    target=inner_self._run_scheduler,
+                    name="file-debounce",
+                    daemon=True,
+                )
+                inner_self._scheduler.start()
+
+            def stop(inner_self):
+                with inner_self._cond:
+                    inner_self._stopped = True
+                    inner_self._cond.notify()
 
             def _schedule_process(inner_self, filepath: Path):
                 """Debounce file processing."""
                 path_str = str(filepath)
+                due = time.monotonic() + inner_self.DEBOUNCE
+
+                with inner_self._cond:
+                    inner_self._pending[path_str] = (due, filepath)
+                    heapq.heappush(inner_self._heap, (due, path_str))
+                    inner_self._cond.notify()
+
+            def _run_scheduler(inner_self):
+                """Single thread that releases debounced paths when due."""
+                while True:
+                    ready = []
+                    with inner_self._cond:
+                        while not inner_self._stopped and not ready:
+                            if not inner_self._heap:
+                                inner_self._cond.wait()
+                                continue
+                            due, path_str = inner_self._heap[0]
+                            delay = due - time.monotonic()
+                            if delay > 0:
+                                inner_self._cond.wait(delay)
+                                continue
+                            heapq.heappop(inner_self._heap)
+                            entry = inner_self._pending.get(path_str)
+                            if entry is not None and entry[0] == due:
+                                del inner_self._pending[path_str]
+                                ready.append(entry[1])
+                        if inner_self._stopped:
+                            return
+                    # Settling can take seconds; run it off the scheduler thread
+                    for filepath in ready:
+                        inner_self._submit(filepath)
+
+            def _submit(inner_self, filepath: Path, written: bool = False):
+                try:
+                    inner_self._pool.submit(inner_self._process_file, filepath, written)
+                except RuntimeError:
+                    pass  # Pool shut down by stop_watching
 
-                with inner_self._lock:
-                    if path_str in inner_self._pending:
-                        inner_self._pending[path_str].cancel()
-
-                    timer = threading.Timer(0.5, inner_self._process_file, args=[filepath])
-                    inner_self._pending[path_str] = timer
-                    timer.start()
-
-            def _process_file(inner_self, filepath: Path):
-                """Process a new file after debounce."""
+            def _process_file(inner_self, filepath: Path, written: bool = False):
+                """Process a new file after debounce (or once its writer closed it)."""
                 try:
                     if not filepath.exists():
                         return
 
                     # Wait for file to be fully written
-                    initial_size = filepath.stat().st_size
-                    time.sleep(0.2)
-
-                    for _ in range(10):
-                        current_size = filepath.stat().st_size
-                        if current_size == initial_size and current_size > 0:
-                            break
-                        initial_size = current_size
+                    if not written:
+                        initial_size = filepath.stat().st_size
                         time.sleep(0.2)
 
+                        for _ in range(10):
+                            current_size = filepath.stat().st_size
+                            if current_size == initial_size and current_size > 0:
+                                break
+                            initial_size = current_size
+                            time.sleep(0.2)
+
+                    self._invalidate_list_cache()
                     info = self._get_image_info_from_path(filepath)
                     if info and self._on_created:
                         self._on_created(filepath.name, info)
 
                 except Exception as e:
                     log.error(f"Error processing new file {filepath}: {e}")
-                finally:
-                    with inner_self._lock:
-                        inner_self._pending.pop(str(filepath), None)
+
+            def _image_path(inner_self, src: str) -> Optional[Path]:
+                """Filter on the raw string before paying for a Path."""
+                dot = src.rfind('.')
+                if dot < 0 or src[dot:].lower() not in self.IMAGE_EXTENSIONS:
+                    return None
+                return Path(src)
 
             def on_created(inner_self, event):
                 if event.is_directory:
                     return
-                filepath = Path(event.src_path)
-                if filepath.suffix.lower() in self.IMAGE_EXTENSIONS:
+                filepath = inner_self._image_path(event.src_path)
+                if filepath is None:
+                    return
+                self._invalidate_list_cache()
+                if inner_self._close_events:
+                    with inner_self._cond:
+                        inner_self._created.add(event.src_path)
+                else:
                     inner_self._schedule_process(filepath)
 
+            def on_closed(inner_self, event):
+                """IN_CLOSE_WRITE: the writer is done, process without settling."""
+                if event.is_directory:
+                    return
+                filepath = inner_self._image_path(event.src_path)
+                if filepath is None:
+                    return
+                with inner_self._cond:
+                    if event.src_path not in inner_self._created:
+                        return
+                    inner_self._created.discard(event.src_path)
+                    inner_self._pending.pop(str(filepath), None)
+                inner_self._submit(filepath, True)
+
             def on_moved(inner_self, event):
                 if event.is_directory:
                     return
-                filepath = Path(event.dest_path)
-                if filepath.suffix.lower() in self.IMAGE_EXTENSIONS:
+                with inner_self._cond:
+                    inner_self._created.discard(event.src_path)
+                self._invalidate_list_cache()
+                filepath = inner_self._image_path(event.dest_path)
+                if filepath is not None:
                     inner_self._schedule_process(filepath)
 
             def on_deleted(inner_self, event):
                 if event.is_directory:
                     return
-                filepath = Path(event.src_path)
-                if filepath.suffix.lower() in self.IMAGE_EXTENSIONS:
-                    if self._on_deleted:
-                        self._on_deleted(filepath.name)
-
-        handler = Handler()
+                filepath = inner_self._image_path(event.src_path)
+                if filepath is None:
+                    return
+                with inner_self._cond:
+                    inner_self._created.discard(event.src_path)
+                self._invalidate_list_cache()
+                if self._on_deleted:
+                    self._on_deleted(filepath.name)
+
+        self._watch_pool = ThreadPoolExecutor(
+            max_workers=self.WATCH_WORKERS,
+            thread_name_prefix="file-watch",
+        )
         self._observer = Observer()
+        handler = Handler(
+            close_events=_emits_close_events(self._observer),
+            pool=self._watch_pool,
+        )
+        self._handler = handler
         self._observer.schedule(handler, str(self.output_dir), recursive=False)
         self._observer.start()
         self._watching = True
@@ -477,17 +893,78 @@ class LocalFileService(FileService):
             self._observer.stop()
             self._observer.join(timeout=5)
             self._observer = None
+        if self._handler:
+            self._handler.stop()
+            self._handler = None
+        if self._watch_pool:
+            self._watch_pool.shutdown(wait=False, cancel_futures=True)
+            self._watch_pool = None
         self._watching = False
         log.info("Stopped watching")
 
     def get_backend_type(self) -> str:
         return "local"
 
-    def _get_image_info_from_path(self, path: Path) -> Optional[ImageInfo]:
-        """Extract image info from a local file."""
-        try:
-            stat = path.stat()
+    def _get_image_info_batch(self, entries: list[os.DirEntry]) -> list[ImageInfo]:
+        """Collect info for a batch of directory entries, skipping unreadable files."""
+        infos = []
+        for entry in entries:
+            try:
+                with self._fs_limit:
+                    stat = entry.stat()
+            except OSError as e:
+                log.error(f"Failed to get info for {entry.path}: {e}")
+                continue
+            info = self._get_image_info_from_path(Path(entry.path), stat)
+            if info:
+                infos.append(info)
+        return infos
+
+    def _get_image_infos(self, entries: list[os.DirEntry]) -> list[ImageInfo]:
+        """Collect info for many entries, fanning batches out to the I/O pool."""
+        batch_size = self.INFO_BATCH_SIZE
+        if len(entries) <= batch_size:
+            return self._get_image_info_batch(entries)
+
+        # One task per batch rather than per file keeps future overhead low
+        batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+        images = []
+        for infos in self._io_pool.map(self._get_image_info_batch, batches):
+            images.extend(infos)
+        return images
 
+    def _get_image_info_from_path(
+        self, path: Path, stat: Optional[os.stat_result] = None
+    ) -> Optional[ImageInfo]:
+        """Extract image info from a local file, reusing unchanged results."""
+        if stat is None:
+            try:
+                with self._fs_limit:
+                    stat = path.stat()
+            except Exception as e:
+                log.error(f"Failed to get info for {path}: {e}")
+                return None
+
+        # mtime and size in the key make stale entries unreachable
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._info_cache_lock:
+            info = self._info_cache.get(key)
+            if info is not None:
+                self._info_cache.move_to_end(key)
+                return info
+
+        with self._fs_limit:
+            info = self._read_image_info(path, stat)
+        if info is not None:
+            with self._info_cache_lock:
+                self._info_cache[key] = info
+                if len(self._info_cache) > self.INFO_CACHE_SIZE:
+                    self._info_cache.popitem(last=False)
+        return info
+
+    def _read_image_info(self, path: Path, stat: os.stat_result) -> Optional[ImageInfo]:
+        """Build ImageInfo for a file, opening it to read dimensions and metadata."""
+        try:
             info = ImageInfo(
                 filename=path.name,
                 size=stat.st_size,
@@ -497,6 +974,14 @@ class LocalFileService(FileService):
             # Try to get image dimensions and metadata
             if path.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp"}:
                 try:
+                    # Fast path: read headers/text chunks directly
+                    header = _parse_image_header(path)
+                    if header is not None:
+                        info.width, info.height, info.format, text = header
+                        if info.format == "PNG":
+                            info.metadata = _comfy_metadata(text)
+                        return info
+
                     from PIL import Image
 
                     with Image.open(path) as img:
@@ -506,20 +991,7 @@ class LocalFileService(FileService):
 
                         # Extract ComfyUI metadata from PNG
                         if hasattr(img, 'text'):
-                            metadata = {}
-                            if 'prompt' in img.text:
-                                try:
-                                    metadata['prompt'] = json.loads(img.text['prompt'])
-                                except json.JSONDecodeError:
-                                    metadata['prompt_raw'] = img.text['prompt']
-                            if 'workflow' in img.text:
-                                try:
-                                    metadata['workflow'] = json.loads(img.text['workflow'])
-                                except json.JSONDecodeError:
-                                    metadata['workflow_raw'] = img.text['workflow']
-                            if 'parameters' in img.text:
-                                metadata['parameters'] = img.text['parameters']
-                            info.metadata = metadata
+                            info.metadata = _comfy_metadata(img.text)
 
                 except Exception as e:
                     log.debug(f"Could not extract image metadata from {path.name}: {e}")
@@ -538,21 +1010,47 @@ class LocalFileService(FileService):
         """List available workflow templates."""
         if not self.templates_dir or not self.templates_dir.exists():
             return []
-        return sorted([p.name for p in self.templates_dir.iterdir() if p.is_dir()])
+        with os.scandir(self.templates_dir) as it:
+            names = sorted(entry.name for entry in it if entry.is_dir())
+        # Forget paths for templates that have gone away. Concurrent
+        # listings may compute the same stale set, so tolerate misses.
+        for stale in set(list(self._tpl_paths)) - set(names):
+            self._tpl_paths.pop(stale, None)
+        return names
+
+    def _template_paths(self, template: str) -> tuple[str, str]:
+        """Return (settings path, graph path) for a template, built once."""
+        paths = self._tpl_paths.get(template)
+        if paths is None:
+            base = os.path.join(os.fspath(self.templates_dir), template)
+            paths = (
+                os.path.join(base, "settings_template.json"),
+                os.path.join(base, "graph_to_prompt.json"),
+            )
+            self._tpl_paths[template] = paths
+        return paths
+
+    def _load_template_json(self, path: str) -> Any:
+        """Decode a template JSON file, rereading it only when its mtime changes."""
+        mtime_ns = os.stat(path).st_mtime_ns
+        hit = self._tpl_cache.get(path)
+        if hit is not None and hit[0] == mtime_ns:
+            return _json_loads(hit[1])
+        with open(path, "rb") as f:
+            raw = f.read()
+        self._tpl_cache[path] = (mtime_ns, raw)
+        return _json_loads(raw)
 
     def get_template_settings(self, template: str) -> Optional[list[dict]]:
         """Get settings for a template."""
         if not self.templates_dir:
             return None
 
-        settings_path = self.templates_dir / template / "settings_template.json"
-        if not settings_path.exists():
-            return None
-
+        settings_path = self._template_paths(template)[0]
         try:
-            with open(settings_path, "r") as f:
-                from collections import OrderedDict
-                return json.load(f, object_pairs_hook=OrderedDict)
+            return self._load_template_json(settings_path)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             log.error(f"Failed to load template settings {template}: {e}")
             return None
@@ -562,10 +1060,11 @@ class LocalFileService(FileService):
         if not self.templates_dir:
             return False
 
-        settings_path = self.templates_dir / template / "settings_template.json"
+        settings_path = self._template_paths(template)[0]
         try:
             with open(settings_path, "w") as f:
                 json.dump(settings, f, indent=2)
+            self._tpl_cache.pop(settings_path, None)
             return True
         except Exception as e:
             log.error(f"Failed to save template settings {template}: {e}")
@@ -576,14 +1075,12 @@ class LocalFileService(FileService):
         if not self.templates_dir:
             return None
 
-        graph_path = self.templates_dir / template / "graph_to_prompt.json"
-        if not graph_path.exists():
-            return None
-
+        graph_path = self._template_paths(template)[1]
         try:
-            with open(graph_path, "r") as f:
-                data = json.load(f)
+            data = self._load_template_json(graph_path)
             return data.get("output", {})
+        except FileNotFoundError:
+            return None
         except Exception as e:
             log.error(f"Failed to load template graph {template}: {e}")
             return None
@@ -593,14 +1090,55 @@ class LocalFileService(FileService):
 # Remote File Service
 # ─────────────────────────────────────────────────────────────
 
+def _parse_batch_response(body: bytes, boundary: str) -> dict[str, Optional[bytes]]:
+    """
+    Split a /api/files/batch multipart body into {filename: data}.
+
+    Each part carries X-Filename (percent-encoded), Content-Length, and
+    X-Status: 404 for missing files (mapped to None).
+    """
+    delimiter = b"--" + boundary.encode("ascii")
+    results: dict[str, Optional[bytes]] = {}
+    pos = body.find(delimiter)
+    while pos != -1:
+        pos += len(delimiter)
+        if body[pos:pos + 2] == b"--":
+            break
+        header_end = body.find(b"\r\n\r\n", pos)
+        if header_end == -1:
+            raise ValueError("Truncated batch part headers")
+        headers = {}
+        for line in body[pos:header_end].decode("latin-1").split("\r\n"):
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        start = header_end + 4
+        length = int(headers.get("content-length", "0"))
+        filename = unquote(headers["x-filename"])
+        results[filename] = None if headers.get("x-status") == "404" else body[start:start + length]
+        pos = body.find(delimiter, start + length)
+    return results
+
+
 class RemoteFileService(FileService):
     """
     File service implementation for remote server access.
 
     Connects to another comfy-viewer server over HTTP to access files.
-    Uses polling for change detection (inotify doesn't work over network).
+    Change detection uses the server's /api/files/events stream, falling
+    back to polling when it is unavailable (inotify doesn't work over network).
     """
 
+    # Seconds without data (server sends keepalives) before reconnecting
+    EVENT_STREAM_READ_TIMEOUT = 45.0
+    # Upper bound for the poll interval while backing off on an idle remote
+    MAX_POLL_INTERVAL = 30.0
+    # Keep-alive connections kept per host (the event stream pins one)
+    HTTP_POOL_SIZE = 32
+    # get_image calls arriving within this window share one batch request
+    BATCH_WINDOW = 0.005
+    BATCH_MAX_SIZE = 16
+
     def __init__(
         self,
         remote_url: str,
@@ -619,16 +1157,43 @@ class RemoteFileService(FileService):
         self.poll_interval = poll_interval
         self.timeout = timeout
 
+        # urllib3 defaults to 10 pooled connections per host; concurrent image
+        # fetches beyond that would open and discard fresh TCP/TLS connections
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.HTTP_POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self._watching = False
         self._watch_thread = None
         self._stop_event = threading.Event()
         self._on_created = None
         self._on_deleted = None
         self._known_files: dict[str, float] = {}  # filename -> modified time
+        self._events_supported: Optional[bool] = None  # unknown until first connect
+        self._last_etag: Optional[str] = None  # ETag of the last polled listing
+        self._event_response = None
+
+        # Coalesced get_image requests: filename -> Future[Optional[bytes]]
+        self._pending_gets: dict[str, Future] = {}
+        self._active_gets = 0  # get_image calls in progress
+        self._pending_lock = threading.Lock()
+        self._batch_supported = True
 
         log.info(f"RemoteFileService initialized: {self.remote_url}")
 
+    @staticmethod
+    def _info_from_dict(item: dict) -> ImageInfo:
+        """Build ImageInfo from the server's JSON representation."""
+        return ImageInfo(
+            filename=item["filename"],
+            size=item["size"],
+            modified=item["modified"],
+            width=item.get("width"),
+            height=item.get("height"),
+            format=item.get("format"),
+            metadata=item.get("metadata", {}),
+        )
+
     def list_images(self, subdirectory: str = "") -> list[ImageInfo]:
         """List images from remote server."""
         try:
@@ -641,18 +1206,7 @@ class RemoteFileService(FileService):
             response.raise_for_status()
 
             data = response.json()
-            images = [
-                ImageInfo(
-                    filename=item["filename"],
-                    size=item["size"],
-                    modified=item["modified"],
-                    width=item.get("width"),
-                    height=item.get("height"),
-                    format=item.get("format"),
-                    metadata=item.get("metadata", {}),
-                )
-                for item in data.get("images", [])
-            ]
+            images = [self._info_from_dict(item) for item in data.get("images", [])]
 
             return images
 
@@ -661,7 +1215,89 @@ class RemoteFileService(FileService):
             return []
 
     def get_image(self, filename: str) -> Optional[bytes]:
-        """Download image from remote server."""
+        """
+        Download image from remote server.
+
+        Concurrent calls within BATCH_WINDOW are coalesced into a single
+        POST /api/files/batch; the first caller in a window sends it. A
+        call with no other get_image in progress is sent at once, without
+        waiting out the window.
+        """
+        if not self._batch_supported:
+            return self._get_image_single(filename)
+
+        batch = None
+        leader = False
+        with self._pending_lock:
+            self._active_gets += 1
+            future = self._pending_gets.get(filename)
+            if future is None:
+                future = Future()
+                self._pending_gets[filename] = future
+                if len(self._pending_gets) == 1:
+                    if self._active_gets == 1:
+                        batch = self._take_pending()  # nothing to batch with
+                    else:
+                        leader = True
+                elif len(self._pending_gets) >= self.BATCH_MAX_SIZE:
+                    batch = self._take_pending()
+
+        try:
+            if leader:
+                time.sleep(self.BATCH_WINDOW)
+                with self._pending_lock:
+                    batch = self._take_pending()
+            if batch:
+                self._fetch_batch(batch)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                # The batch carrying this file is stuck; don't hang with it
+                log.warning(f"Batched fetch of {filename} timed out, fetching individually")
+                return self._get_image_single(filename)
+        finally:
+            with self._pending_lock:
+                self._active_gets -= 1
+
+    def _take_pending(self) -> dict[str, Future]:
+        """Detach the current batch. Caller must hold _pending_lock."""
+        batch = self._pending_gets
+        self._pending_gets = {}
+        return batch
+
+    def _fetch_batch(self, batch: dict[str, Future]) -> None:
+        """Resolve a batch of pending downloads with one request."""
+        if len(batch) == 1 or not self._batch_supported:
+            for filename, future in batch.items():
+                future.set_result(self._get_image_single(filename))
+            return
+
+        results: dict[str, Optional[bytes]] = {}
+        try:
+            response = self._session.post(
+                f"{self.remote_url}/api/files/batch",
+                json={"filenames": list(batch)},
+                timeout=self.timeout,
+            )
+            if response.status_code in (404, 405):
+                log.info("Remote has no batch endpoint, fetching images individually")
+                self._batch_supported = False
+            else:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                boundary = content_type.partition("boundary=")[2].strip('"')
+                results = _parse_batch_response(response.content, boundary)
+        except Exception as e:
+            log.warning(f"Batch image fetch failed, retrying individually: {e}")
+
+        for filename, future in batch.items():
+            if filename in results:
+                future.set_result(results[filename])
+            else:
+                future.set_result(self._get_image_single(filename))
+
+    def _get_image_single(self, filename: str) -> Optional[bytes]:
+        """Download one image with its own request."""
         try:
             response = self._session.get(
                 f"{self.remote_url}/api/files/image/{filename}",
@@ -678,7 +1314,7 @@ class RemoteFileService(FileService):
             log.error(f"Failed to get image {filename} from remote: {e}")
             return None
 
-    def stream_image(self, filename: str, chunk_size: int = 8192) -> Iterator[bytes]:
+    def stream_image(self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
         """Stream image from remote server."""
         try:
             response = self._session.get(
@@ -711,17 +1347,7 @@ class RemoteFileService(FileService):
                 return None
 
             response.raise_for_status()
-            data = response.json()
-
-            return ImageInfo(
-                filename=data["filename"],
-                size=data["size"],
-                modified=data["modified"],
-                width=data.get("width"),
-                height=data.get("height"),
-                format=data.get("format"),
-                metadata=data.get("metadata", {}),
-            )
+            return self._info_from_dict(response.json())
 
         except Exception as e:
             log.error(f"Failed to get info for {filename} from remote: {e}")
@@ -744,18 +1370,30 @@ class RemoteFileService(FileService):
 
     def copy_image(self, filename: str, destination: Path) -> bool:
         """Download image and save to local destination."""
+        # Stream into a sibling temp file so memory stays at one chunk and a
+        # failed download never leaves a truncated file at the destination
+        partial = destination.with_name(destination.name + ".part")
         try:
-            data = self.get_image(filename)
-            if data is None:
-                return False
-
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            destination.write_bytes(data)
+            with self._session.get(
+                f"{self.remote_url}/api/files/image/{filename}",
+                stream=True,
+                timeout=self.timeout,
+            ) as response:
+                if response.status_code == 404:
+                    return False
+                response.raise_for_status()
+
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                with open(partial, "wb") as out:
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        out.write(chunk)
+            os.replace(partial, destination)
             log.info(f"Downloaded {filename} to {destination}")
             return True
 
         except Exception as e:
             log.error(f"Failed to copy {filename} from remote: {e}")
+            partial.unlink(missing_ok=True)
             return False
 
     def watch_changes(
@@ -763,7 +1401,7 @@ class RemoteFileService(FileService):
         on_created: Optional[Callable[[str, ImageInfo], None]] = None,
         on_deleted: Optional[Callable[[str], None]] = None,
     ) -> None:
-        """Start polling for file changes."""
+        """Start watching for file changes (event stream, or polling)."""
         self._on_created = on_created
         self._on_deleted = on_deleted
         self._stop_event.clear()
@@ -772,46 +1410,161 @@ class RemoteFileService(FileService):
         for img in self.list_images():
             self._known_files[img.filename] = img.modified
 
-        def poll_loop():
-            while not self._stop_event.is_set():
-                try:
-                    current_files = {}
-                    for img in self.list_images():
-                        current_files[img.filename] = img.modified
-
-                        # Check for new or modified files
-                        if img.filename not in self._known_files:
-                            log.info(f"Remote: new file detected: {img.filename}")
-                            if self._on_created:
-                                self._on_created(img.filename, img)
-                        elif self._known_files[img.filename] < img.modified:
-                            log.info(f"Remote: file modified: {img.filename}")
-                            if self._on_created:
-                                self._on_created(img.filename, img)
-
-                    # Check for deleted files
-                    for filename in self._known_files:
-                        if filename not in current_files:
-                            log.info(f"Remote: file deleted: {filename}")
-                            if self._on_deleted:
-                                self._on_deleted(filename)
-
-                    self._known_files = current_files
+        self._watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._watch_thread.start()
+        self._watching = True
+
+        log.info(f"Started watching (events, polling every {self.poll_interval}s as fallback): {self.remote_url}")
 
+    def _watch_loop(self) -> None:
+        """Follow the event stream, reconciling by poll whenever it drops."""
+        idle_polls = 0
+        while not self._stop_event.is_set():
+            reconnect_now = False
+            if self._events_supported is not False:
+                started = time.monotonic()
+                try:
+                    # A stream that ran for a while and closed cleanly can be
+                    # resumed at once; errors and instant closes wait a tick
+                    if self._stream_events():
+                        reconnect_now = time.monotonic() - started >= self.poll_interval
                 except Exception as e:
-                    log.warning(f"Polling error: {e}")
+                    if not self._stop_event.is_set():
+                        log.debug(f"Remote event stream interrupted: {e}")
+                finally:
+                    self._event_response = None
+
+            if self._stop_event.is_set():
+                break
+
+            # Catch up on anything missed while disconnected (or poll tick)
+            if self._poll_once():
+                idle_polls = 0
+            else:
+                idle_polls = min(idle_polls + 1, 16)
+            if not reconnect_now:
+                # Double the wait per idle tick; any change snaps it back
+                wait = min(self.poll_interval * (2 ** idle_polls), self.MAX_POLL_INTERVAL)
+                self._stop_event.wait(max(wait, self.poll_interval))
+
+    def _stream_events(self) -> bool:
+        """
+        Consume /api/files/events until the connection ends.
 
-                self._stop_event.wait(self.poll_interval)
+        Returns:
+            True if the stream was connected, False if the server lacks it
+        """
+        response = self._session.get(
+            f"{self.remote_url}/api/files/events",
+            stream=True,
+            headers={"Accept": "text/event-stream"},
+            timeout=(self.timeout, self.EVENT_STREAM_READ_TIMEOUT),
+        )
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code in (404, 405) or not content_type.startswith("text/event-stream"):
+            response.close()
+            if self._events_supported is not False:
+                log.info("Remote has no event stream, using polling")
+            self._events_supported = False
+            return False
+        response.raise_for_status()
+
+        if self._events_supported is None:
+            log.info("Remote event stream connected")
+        self._events_supported = True
+        self._event_response = response
+
+        with response:
+            data_lines = []
+            for line in response.iter_lines(decode_unicode=True):
+                if self._stop_event.is_set():
+                    break
+                if line:
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                    continue
+                if data_lines:
+                    self._handle_stream_event(json.loads("\n".join(data_lines)))
+                    data_lines = []
+        return True
+
+    def _handle_stream_event(self, event: dict) -> None:
+        """Apply one event from the remote stream."""
+        event_type = event.get("type")
+        if event_type == "created":
+            img = self._info_from_dict(event["image"])
+            self._known_files[img.filename] = img.modified
+            log.info(f"Remote: new file detected: {img.filename}")
+            if self._on_created:
+                self._on_created(img.filename, img)
+        elif event_type == "deleted":
+            filename = event["filename"]
+            if self._known_files.pop(filename, None) is not None:
+                log.info(f"Remote: file deleted: {filename}")
+                if self._on_deleted:
+                    self._on_deleted(filename)
+
+    def _poll_once(self) -> bool:
+        """
+        Diff the remote listing against known files and fire callbacks.
 
-        self._watch_thread = threading.Thread(target=poll_loop, daemon=True)
-        self._watch_thread.start()
-        self._watching = True
+        Returns:
+            True if any file was created, modified, or deleted
+        """
+        changed = False
+        try:
+            # Conditional GET: an unchanged listing comes back as an empty 304
+            headers = {"If-None-Match": self._last_etag} if self._last_etag else {}
+            response = self._session.get(
+                f"{self.remote_url}/api/files/list",
+                headers=headers,
+                timeout=self.timeout,
+            )
+            if response.status_code == 304:
+                return False
+            response.raise_for_status()
+            images = [self._info_from_dict(item) for item in response.json().get("images", [])]
+
+            current_files = {img.filename: img.modified for img in images}
+            known = self._known_files
+
+            # Set differences run in C; an idle tick touches no Python loop
+            if current_files.items() - known.items():
+                changed = True
+                for img in images:
+                    previous = known.get(img.filename)
+                    if previous is None:
+                        log.info(f"Remote: new file detected: {img.filename}")
+                        if self._on_created:
+                            self._on_created(img.filename, img)
+                    elif previous < img.modified:
+                        log.info(f"Remote: file modified: {img.filename}")
+                        if self._on_created:
+                            self._on_created(img.filename, img)
+
+            for filename in known.keys() - current_files.keys():
+                changed = True
+                log.info(f"Remote: file deleted: {filename}")
+                if self._on_deleted:
+                    self._on_deleted(filename)
+
+            self._known_files = current_files
+            self._last_etag = response.headers.get("ETag")
 
-        log.info(f"Started watching (polling every {self.poll_interval}s): {self.remote_url}")
+        except Exception as e:
+            log.warning(f"Polling error: {e}")
+        return changed
 
     def stop_watching(self) -> None:
-        """Stop polling for changes."""
+        """Stop watching for changes."""
         self._stop_event.set()
+        response = self._event_response
+        if response is not None:
+            # Unblock the reader thread waiting on the stream
+            try:
+                response.close()
+            except Exception:
+                pass
         if self._watch_thread:
             self._watch_thread.join(timeout=5)
             self._watch_thread = None
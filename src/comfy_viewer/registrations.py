@@ -6,34 +6,157 @@ Each registration represents a generation event with:
 - Associated data (char_str, flags, future extensions via hooks)
 """
 
+import atexit
+import importlib.util
 import json
 import logging
+import os
 import sqlite3
+import sys
 import threading
 import time
+import weakref
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Optional
+from secrets import token_hex
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 
 from . import config as app_config
-# hooks is a runtime directory at package root - bootstrap as a package
-import sys
-import importlib.util
-_hooks_dir = Path(__file__).parent.parent.parent / "hooks"
-_spec = importlib.util.spec_from_file_location(
-    "comfy_viewer_hooks",
-    _hooks_dir / "__init__.py",
-    submodule_search_locations=[str(_hooks_dir)]
-)
-_hooks_mod = importlib.util.module_from_spec(_spec)
-sys.modules["comfy_viewer_hooks"] = _hooks_mod
-_spec.loader.exec_module(_hooks_mod)
-run_hooks = _hooks_mod.run_all
 
 log = logging.getLogger("comfy-viewer.registrations")
 
-# Database location (cross-platform data dir)
-_config = app_config.load_config()
-DB_PATH = Path(_config.get("data_dir", Path.home() / ".local/share/comfy-viewer")) / "registrations.db"
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a value to JSON bytes for a BLOB column."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib handles those
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# Accepts both BLOB values and TEXT written before the switch to BLOB
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# hooks is a runtime directory at package root, loaded as a package on demand
+_HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+
+
+def load_hooks():
+    """Return the hooks package, loading it as comfy_viewer_hooks on first use."""
+    module = sys.modules.get("comfy_viewer_hooks")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "comfy_viewer_hooks",
+            _HOOKS_DIR / "__init__.py",
+            submodule_search_locations=[str(_HOOKS_DIR)]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["comfy_viewer_hooks"] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules["comfy_viewer_hooks"]
+            raise
+    return module
+
+
+@lru_cache(maxsize=1)
+def _db_path() -> Path:
+    """Database location (cross-platform data dir), resolved on first use."""
+    config = app_config.load_config()
+    return Path(config.get("data_dir", Path.home() / ".local/share/comfy-viewer")) / "registrations.db"
+
+
+# Per-connection settings. WAL lets readers run alongside a writer, and
+# synchronous=NORMAL is durable under WAL with one fsync per checkpoint
+# rather than two per commit. busy_timeout makes writers wait, not fail.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+# Key-value tables are clustered on their primary key (WITHOUT ROWID), so
+# a lookup or write touches one B-tree instead of the PK index plus the
+# rowid table. {name} lets the migration build the new table beside the old.
+_TABLE_SCHEMAS = {
+    # Workflow input overrides: user's saved values for each workflow
+    "workflow_inputs": """
+        CREATE TABLE IF NOT EXISTS {name} (
+            workflow_name TEXT NOT NULL,      -- Conduit workflow name
+            input_key TEXT NOT NULL,          -- Input identifier
+            value BLOB,                       -- JSON-encoded value
+            updated_at REAL NOT NULL,         -- Unix timestamp
+            PRIMARY KEY (workflow_name, input_key)
+        ) WITHOUT ROWID
+    """,
+    # Settings table: key-value store for app settings
+    "settings": """
+        CREATE TABLE IF NOT EXISTS {name} (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID
+    """,
+}
+
+# Hot statements, shared as constants so every call site hits the
+# connection's prepared-statement cache with the same text
+# Registration dict fields projected in SQL, so rows convert with dict(row):
+# filename and modified are aliases the frontend expects, and created_at
+# (seconds) is derived from the integer created_at_ns ordering key. Every
+# summary column is in idx_reg_timeline; the full form adds the data blob.
+SUMMARY_COLUMNS = """
+    id, image_path AS filename, image_path,
+    created_at_ns / 1000000000 + (created_at_ns % 1000000000) / 1e9 AS created_at,
+    created_at_ns, created_at_ns / 1000000000 AS modified, source, flagged,
+    char_str, rating
+"""
+FULL_COLUMNS = SUMMARY_COLUMNS + ", data"
+
+SQL_GET_BY_ID = f"SELECT {FULL_COLUMNS} FROM registrations WHERE id = ?"
+SQL_GET_BY_IMAGE = f"SELECT {FULL_COLUMNS} FROM registrations WHERE image_path = ?"
+SQL_INSERT_REG = """
+    INSERT OR IGNORE INTO registrations
+        (id, created_at, created_at_ns, source, image_path, char_str, data)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+# RETURNING (SQLite 3.35+) hands back the new row from the insert itself;
+# an ignored duplicate returns nothing
+SQL_INSERT_REG_RETURNING = SQL_INSERT_REG.rstrip() + f" RETURNING {FULL_COLUMNS}"
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_UPDATE_FLAG = "UPDATE registrations SET flagged = ? WHERE image_path = ?"
+SQL_UPDATE_RATING = "UPDATE registrations SET rating = ? WHERE image_path = ?"
+SQL_GET_SUMMARY_BY_IMAGE = f"SELECT {SUMMARY_COLUMNS} FROM registrations WHERE image_path = ?"
+# The page and the total in one execution; the scalar subquery keeps the
+# page itself driven by idx_reg_timeline (a COUNT(*) OVER () window would
+# force every row through the sort before LIMIT applies). The keyset form
+# seeks past the last row seen instead of skipping OFFSET rows.
+_TIMELINE_SQL = """
+    SELECT {columns}, (SELECT COUNT(*) FROM registrations) AS total
+    FROM registrations
+    {where}
+    ORDER BY created_at_ns DESC
+    LIMIT ? OFFSET ?
+"""
+SQL_SELECT_ALL = _TIMELINE_SQL.format(columns=FULL_COLUMNS, where="")
+SQL_SELECT_BEFORE = _TIMELINE_SQL.format(columns=FULL_COLUMNS, where="WHERE created_at_ns < ?")
+SQL_SELECT_ALL_SUMMARY = _TIMELINE_SQL.format(columns=SUMMARY_COLUMNS, where="")
+SQL_SELECT_BEFORE_SUMMARY = _TIMELINE_SQL.format(
+    columns=SUMMARY_COLUMNS, where="WHERE created_at_ns < ?"
+)
+SQL_COUNT_ALL = "SELECT COUNT(*) FROM registrations"
+SQL_CHECK_EXISTS = "SELECT EXISTS(SELECT 1 FROM registrations WHERE image_path = ?)"
 
 # ─────────────────────────────────────────────────────────────
 # Shared Event Processing Logic
@@ -42,6 +165,10 @@ DB_PATH = Path(_config.get("data_dir", Path.home() / ".local/share/comfy-viewer"
 # Tags to prioritize for display (in order of preference)
 # If any of these are present, select that image for registration
 PREFERRED_IMAGE_TAGS = ["CharImg", "FinalImage", "Output"]
+_TAG_RANK = {tag: rank for rank, tag in enumerate(PREFERRED_IMAGE_TAGS)}
+
+# Suffixes accepted for legacy string outputs
+_IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".webp"})
 
 
 def select_preferred_image(outputs: list) -> tuple[Optional[dict], Optional[str]]:
@@ -60,28 +187,37 @@ def select_preferred_image(outputs: list) -> tuple[Optional[dict], Optional[str]
     Returns:
         Tuple of (selected_output_dict, tag_name) or (None, None) if no images
     """
-    # Filter to image outputs only
-    image_outputs = []
+    # One pass: keep the first image seen and the best-ranked tagged image
+    no_rank = len(PREFERRED_IMAGE_TAGS)
+    first = None
+    best, best_rank = None, no_rank
     for output in outputs:
-        if isinstance(output, dict) and output.get("file_type") == "image":
-            image_outputs.append(output)
-        elif isinstance(output, str) and output.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+        if isinstance(output, dict):
+            if output.get("file_type") != "image":
+                continue
+        elif isinstance(output, str) and os.path.splitext(output)[1].lower() in _IMAGE_SUFFIXES:
             # Handle string paths (legacy format)
-            image_outputs.append({"file_path": output, "tag_name": "unknown"})
-
-    if not image_outputs:
+            output = {"file_path": output, "tag_name": "unknown"}
+        else:
+            continue
+
+        if first is None:
+            first = output
+        rank = _TAG_RANK.get(output.get("tag_name", "unknown"), no_rank)
+        if rank < best_rank:
+            best, best_rank = output, rank
+            if rank == 0:
+                break
+
+    if first is None:
         return None, None
 
-    # Select preferred image by tag priority
-    for preferred_tag in PREFERRED_IMAGE_TAGS:
-        for output in image_outputs:
-            tag = output.get("tag_name", "unknown")
-            if tag == preferred_tag:
-                log.debug(f"Selected preferred tag '{preferred_tag}'")
-                return output, tag
+    if best is not None:
+        tag = best.get("tag_name", "unknown")
+        log.debug(f"Selected preferred tag '{tag}'")
+        return best, tag
 
     # Fallback to first image
-    first = image_outputs[0]
     tag = first.get("tag_name", "unknown")
     log.debug(f"No preferred tag found, using '{tag}'")
     return first, tag
@@ -105,107 +241,185 @@ def get_relative_image_path(filepath: Path, output_dir: Path) -> str:
         return filepath.name
 
 
+class _ThreadConnection:
+    """
+    Owns one thread's connection and closes it when released.
+
+    Held only by the thread's local storage (and weakly by the store), so
+    the connection closes when its thread exits. sqlite3.Connection itself
+    cannot be weakly referenced.
+    """
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error as e:
+            log.debug(f"Closing registrations connection failed: {e}")
+
+    __del__ = close
+
+
 class RegistrationStore:
     """
     SQLite-backed storage for registrations.
 
-    Thread-safe singleton - use get_store() to access.
+    Thread-safe; use get_store() for the shared instance.
     """
 
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    # Max image paths bound into a single DELETE ... IN (...)
+    DELETE_CHUNK_SIZE = 500
 
     def __init__(self):
-        if self._initialized:
-            return
-
-        self._db_lock = threading.RLock()
+        # One long-lived connection per thread, opened on first use
+        self._local = threading.local()
+        # Live per-thread connections, so shutdown can close them; entries
+        # drop out as their threads exit
+        self._conns: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
+        self._conns_lock = threading.Lock()
+        atexit.register(self._close_connections)
         self._init_db()
-        self._initialized = True
-        log.info(f"RegistrationStore initialized: {DB_PATH}")
+        log.info(f"RegistrationStore initialized: {_db_path()}")
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get a connection for the current thread."""
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the connection for the current thread, opening it on first use."""
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            conn = sqlite3.connect(_db_path(), check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            owner = _ThreadConnection(conn)
+            self._local.owner = owner
+            with self._conns_lock:
+                self._conns.add(owner)
+        return owner.conn
+
+    def _close_connections(self):
+        """Close live connections, then refresh planner statistics once."""
+        with self._conns_lock:
+            owners = list(self._conns)
+            self._conns.clear()
+        for owner in owners:
+            owner.close()
+        try:
+            # 0x10002: check every table, not just those this (fresh)
+            # connection has queried; older SQLite ignores the extra bit
+            conn = sqlite3.connect(_db_path())
+            try:
+                conn.execute("PRAGMA optimize=0x10002")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            log.debug(f"Optimizing registrations database failed: {e}")
+
+    def _analyze(self, conn: sqlite3.Connection):
+        """Refresh query planner statistics (sampled, so cheap on large tables)."""
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        conn.commit()
 
     def _init_db(self):
         """Initialize database schema."""
-        with self._db_lock:
-            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-            conn = self._get_conn()
-            try:
-                conn.executescript("""
-                    -- Registrations table: each row is a generation event
-                    CREATE TABLE IF NOT EXISTS registrations (
-                        id TEXT PRIMARY KEY,              -- From folder name or auto-generated
-                        created_at REAL NOT NULL,         -- Unix timestamp
-                        source TEXT NOT NULL,             -- "conduit", "file_watcher", "scan"
-
-                        -- The displayable image (required)
-                        image_path TEXT NOT NULL UNIQUE,
-
-                        -- Common metadata (columns for fast queries)
-                        flagged INTEGER DEFAULT 0,
-                        char_str TEXT,                    -- Character name (from hook)
-
-                        -- Extensible data (JSON for future fields from hooks)
-                        data TEXT
-                    );
-
-                    -- Index for fast timeline queries
-                    CREATE INDEX IF NOT EXISTS idx_reg_created
-                        ON registrations(created_at DESC);
-
-                    -- Index for flagged items
-                    CREATE INDEX IF NOT EXISTS idx_reg_flagged
-                        ON registrations(flagged) WHERE flagged = 1;
-
-                    -- Workflow input overrides: user's saved values for each workflow
-                    CREATE TABLE IF NOT EXISTS workflow_inputs (
-                        workflow_name TEXT NOT NULL,      -- Conduit workflow name
-                        input_key TEXT NOT NULL,          -- Input identifier
-                        value TEXT,                       -- JSON-encoded value
-                        updated_at REAL NOT NULL,         -- Unix timestamp
-                        PRIMARY KEY (workflow_name, input_key)
-                    );
-
-                    -- Index for fast workflow lookups
-                    CREATE INDEX IF NOT EXISTS idx_workflow_inputs_name
-                        ON workflow_inputs(workflow_name);
-
-                    -- Settings table: key-value store for app settings
-                    CREATE TABLE IF NOT EXISTS settings (
-                        key TEXT PRIMARY KEY,
-                        value TEXT,
-                        updated_at REAL NOT NULL
-                    );
+        _db_path().parent.mkdir(parents=True, exist_ok=True)
+        conn = self._get_conn()
+        # Journal mode is stored in the database file, so set it once
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.executescript("""
+            -- Registrations table: each row is a generation event
+            CREATE TABLE IF NOT EXISTS registrations (
+                id TEXT PRIMARY KEY,              -- From folder name or auto-generated
+                created_at REAL NOT NULL,         -- Unix timestamp (see created_at_ns)
+                source TEXT NOT NULL,             -- "conduit", "file_watcher", "scan"
+
+                -- The displayable image (required)
+                image_path TEXT NOT NULL UNIQUE,
+
+                -- Common metadata (columns for fast queries)
+                flagged INTEGER DEFAULT 0,
+                char_str TEXT,                    -- Character name (from hook)
+
+                -- Extensible data (JSON for future fields from hooks;
+                -- UTF-8 bytes, older rows may hold TEXT)
+                data BLOB
+            );
+
+            -- Index for flagged items
+            CREATE INDEX IF NOT EXISTS idx_reg_flagged
+                ON registrations(flagged) WHERE flagged = 1;
+        """)
+        for name, schema in _TABLE_SCHEMAS.items():
+            conn.execute(schema.format(name=name))
+        conn.commit()
+
+        # Migration: rebuild key-value tables created before WITHOUT ROWID.
+        # workflow_name leads the primary key, so its separate index goes too.
+        for name, schema in _TABLE_SCHEMAS.items():
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+            ).fetchone()
+            if "WITHOUT ROWID" in row["sql"].upper():
+                continue
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DROP INDEX IF EXISTS idx_workflow_inputs_name")
+                conn.execute(schema.format(name=f"{name}_new"))
+                conn.execute(f"INSERT INTO {name}_new SELECT * FROM {name}")
+                conn.execute(f"DROP TABLE {name}")
+                conn.execute(f"ALTER TABLE {name}_new RENAME TO {name}")
+            log.info(f"Migration: Rebuilt '{name}' table as WITHOUT ROWID")
+
+        # Migration: Add rating column if it doesn't exist
+        # rating: -1 = dislike, 0 = neutral (default), 1 = like
+        cursor = conn.execute("PRAGMA table_info(registrations)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "rating" not in columns:
+            conn.execute("ALTER TABLE registrations ADD COLUMN rating INTEGER DEFAULT 0")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reg_rating
+                    ON registrations(rating) WHERE rating != 0
+            """)
+            conn.commit()
+            log.info("Migration: Added 'rating' column to registrations table")
+
+        # Migration: integer nanosecond timestamps for ordering. They pack
+        # smaller than REAL in index pages and compare without floating point.
+        if "created_at_ns" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE registrations ADD COLUMN created_at_ns INTEGER")
+                # Whole and fractional seconds separately: created_at * 1e9
+                # alone rounds to a multiple of 256ns in double precision
+                conn.execute("""
+                    UPDATE registrations SET created_at_ns =
+                        CAST(created_at AS INTEGER) * 1000000000
+                        + CAST(ROUND((created_at - CAST(created_at AS INTEGER)) * 1e9) AS INTEGER)
                 """)
-                conn.commit()
-
-                # Migration: Add rating column if it doesn't exist
-                # rating: -1 = dislike, 0 = neutral (default), 1 = like
-                cursor = conn.execute("PRAGMA table_info(registrations)")
-                columns = [row[1] for row in cursor.fetchall()]
-                if "rating" not in columns:
-                    conn.execute("ALTER TABLE registrations ADD COLUMN rating INTEGER DEFAULT 0")
-                    conn.execute("""
-                        CREATE INDEX IF NOT EXISTS idx_reg_rating
-                            ON registrations(rating) WHERE rating != 0
-                    """)
-                    conn.commit()
-                    log.info("Migration: Added 'rating' column to registrations table")
-            finally:
-                conn.close()
+            log.info("Migration: Added 'created_at_ns' column to registrations table")
+
+        # Timeline index covering every column but the (large) data blob, so
+        # pages that skip data are served from the index alone. Built after
+        # the column migrations; replaces the sort-key-only idx_reg_created
+        # and the earlier REAL-keyed idx_reg_timeline.
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_reg_timeline'"
+        ).fetchone()
+        with conn:
+            conn.execute("DROP INDEX IF EXISTS idx_reg_created")
+            if row is not None and "created_at_ns" not in row["sql"]:
+                conn.execute("DROP INDEX idx_reg_timeline")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reg_timeline
+                    ON registrations(created_at_ns DESC, id, image_path, source,
+                                     flagged, char_str, rating)
+            """)
+
+        # Keep the planner on the timeline/partial indexes as the table grows
+        self._analyze(conn)
 
     # ─────────────────────────────────────────────────────────────
     # Registration Operations
@@ -233,9 +447,10 @@ class RegistrationStore:
             The created/updated registration dict, or None if already exists
         """
         # Use current time as the unique ordering key.
-        # Each registration happens at a slightly different moment (microseconds),
+        # Each registration happens at a slightly different moment (nanoseconds),
         # so the order is locked in at first registration and never changes.
-        created_at = time.time()
+        created_at_ns = time.time_ns()
+        created_at = created_at_ns / 1e9
 
         # Determine folder path if not provided
         if folder_path is None:
@@ -248,10 +463,7 @@ class RegistrationStore:
                 registration_id = Path(image_path).parent.name
             else:
                 # Generate ID from timestamp + random suffix
-                import random
-                import string
-                suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
-                registration_id = f"{int(created_at)}_{suffix}"
+                registration_id = f"{int(created_at)}_{token_hex(4)}"
 
         # Build base data
         current_data = {
@@ -262,7 +474,7 @@ class RegistrationStore:
 
         # Run hooks to extract additional data
         if folder_path.exists():
-            current_data = run_hooks(folder_path, current_data)
+            current_data = load_hooks().run_all(folder_path, current_data)
 
         # Extract known fields, put rest in data JSON
         char_str = current_data.pop("char_str", None)
@@ -271,104 +483,110 @@ class RegistrationStore:
         current_data.pop("caller_context", None)  # Don't store in DB, only used by hooks
 
         # Remaining data goes into JSON blob
-        extra_data = json.dumps(current_data) if current_data else None
-
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                # Use INSERT OR IGNORE to avoid duplicates
-                cursor = conn.execute("""
-                    INSERT OR IGNORE INTO registrations
-                        (id, created_at, source, image_path, char_str, data)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (registration_id, created_at, source, image_path, char_str, extra_data))
-                conn.commit()
-
+        extra_data = _dumps(current_data) if current_data else None
+
+        conn = self._get_conn()
+        params = (
+            registration_id, created_at, created_at_ns, source, image_path, char_str, extra_data
+        )
+        # Use INSERT OR IGNORE to avoid duplicates
+        with conn:
+            if HAS_RETURNING:
+                row = conn.execute(SQL_INSERT_REG_RETURNING, params).fetchone()
+            else:
+                cursor = conn.execute(SQL_INSERT_REG, params)
+                row = None
                 if cursor.rowcount > 0:
-                    log.debug(f"Registered: {image_path} (id={registration_id}, char_str={char_str})")
-                    return self.get(registration_id)
-                else:
-                    log.debug(f"Already registered: {image_path}")
-                    return None
-            finally:
-                conn.close()
+                    row = conn.execute(SQL_GET_BY_ID, (registration_id,)).fetchone()
+
+        if row is not None:
+            log.debug(f"Registered: {image_path} (id={registration_id}, char_str={char_str})")
+            return self._row_to_dict(row)
+        else:
+            log.debug(f"Already registered: {image_path}")
+            return None
 
     def get(self, registration_id: str) -> Optional[dict]:
         """Get a registration by ID."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT * FROM registrations WHERE id = ?", (registration_id,)
-                ).fetchone()
-                if row:
-                    return self._row_to_dict(row)
-                return None
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        row = conn.execute(SQL_GET_BY_ID, (registration_id,)).fetchone()
+        if row:
+            return self._row_to_dict(row)
+        return None
 
     def get_by_image(self, image_path: str) -> Optional[dict]:
         """Get a registration by image path."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT * FROM registrations WHERE image_path = ?", (image_path,)
-                ).fetchone()
-                if row:
-                    return self._row_to_dict(row)
-                return None
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        row = conn.execute(SQL_GET_BY_IMAGE, (image_path,)).fetchone()
+        if row:
+            return self._row_to_dict(row)
+        return None
+
+    def get_summary_by_image(self, image_path: str) -> Optional[dict]:
+        """Get a registration by image path without its data blob."""
+        conn = self._get_conn()
+        row = conn.execute(SQL_GET_SUMMARY_BY_IMAGE, (image_path,)).fetchone()
+        if row:
+            return self._row_to_summary(row)
+        return None
 
     def get_all(
         self,
         offset: int = 0,
         limit: int = 50,
+        before_ns: Optional[int] = None,
+        include_data: bool = True,
     ) -> tuple[list[dict], int]:
         """
         Get paginated list of registrations sorted by creation time (newest first).
 
+        Args:
+            offset: Rows to skip (applied after `before_ns`)
+            limit: Maximum rows to return
+            before_ns: Only return rows created before this nanosecond
+                timestamp; pass the last row's created_at_ns to page deep
+                without an OFFSET scan
+            include_data: Parse and include the data blob; without it the page
+                is read from the covering timeline index alone
+
         Returns:
             (list of registration dicts, total count)
         """
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                # Get total count
-                total = conn.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
-
-                # Get paginated results
-                rows = conn.execute("""
-                    SELECT * FROM registrations
-                    ORDER BY created_at DESC
-                    LIMIT ? OFFSET ?
-                """, (limit, offset)).fetchall()
-
-                registrations = [self._row_to_dict(row) for row in rows]
-                return registrations, total
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        if before_ns is None:
+            sql = SQL_SELECT_ALL if include_data else SQL_SELECT_ALL_SUMMARY
+            rows = conn.execute(sql, (limit, offset)).fetchall()
+        else:
+            sql = SQL_SELECT_BEFORE if include_data else SQL_SELECT_BEFORE_SUMMARY
+            rows = conn.execute(sql, (before_ns, limit, offset)).fetchall()
+
+        if rows:
+            total = rows[0]["total"]
+        else:
+            # Past the end: no row to carry the count
+            total = conn.execute(SQL_COUNT_ALL).fetchone()[0]
+
+        convert = self._row_to_dict if include_data else self._row_to_summary
+        registrations = [convert(row) for row in rows]
+        return registrations, total
+
+    def _row_to_summary(self, row: sqlite3.Row) -> dict:
+        """Convert a SUMMARY_COLUMNS row to a registration dict."""
+        reg = dict(row)
+        reg.pop("total", None)  # timeline queries carry the count on each row
+        reg["flagged"] = bool(reg["flagged"])
+        return reg
 
     def _row_to_dict(self, row: sqlite3.Row) -> dict:
-        """Convert a database row to a registration dict."""
-        reg = {
-            "id": row["id"],
-            "filename": row["image_path"],  # Alias for frontend compatibility
-            "image_path": row["image_path"],
-            "created_at": row["created_at"],
-            "modified": int(row["created_at"]),  # Alias for frontend
-            "source": row["source"],
-            "flagged": bool(row["flagged"]),
-            "char_str": row["char_str"],
-            "rating": row["rating"] if "rating" in row.keys() else 0,
-        }
+        """Convert a FULL_COLUMNS row to a registration dict, parsing data."""
+        reg = self._row_to_summary(row)
 
         # Parse extra data if present
-        if row["data"]:
+        data = reg.pop("data")
+        if data:
             try:
-                reg["data"] = json.loads(row["data"])
-            except json.JSONDecodeError:
+                reg["data"] = _loads(data)
+            except ValueError:
                 pass
 
         return reg
@@ -379,54 +597,38 @@ class RegistrationStore:
 
     def set_flagged(self, image_path: str, flagged: bool) -> bool:
         """Set the flagged status of a registration."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                cursor = conn.execute(
-                    "UPDATE registrations SET flagged = ? WHERE image_path = ?",
-                    (1 if flagged else 0, image_path)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute(SQL_UPDATE_FLAG, (1 if flagged else 0, image_path))
+        return cursor.rowcount > 0
 
     def toggle_flag(self, image_path: str) -> Optional[bool]:
         """Toggle flag and return new status."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                # Get current status
-                row = conn.execute(
-                    "SELECT flagged FROM registrations WHERE image_path = ?",
-                    (image_path,)
-                ).fetchone()
-                if not row:
-                    return None
-
-                new_status = not bool(row["flagged"])
-                conn.execute(
-                    "UPDATE registrations SET flagged = ? WHERE image_path = ?",
-                    (1 if new_status else 0, image_path)
-                )
-                conn.commit()
-                return new_status
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        with conn:
+            # Take the write lock before reading so the toggle is atomic
+            conn.execute("BEGIN IMMEDIATE")
+            # Get current status
+            row = conn.execute(
+                "SELECT flagged FROM registrations WHERE image_path = ?",
+                (image_path,)
+            ).fetchone()
+            if not row:
+                return None
+
+            new_status = not bool(row["flagged"])
+            conn.execute(SQL_UPDATE_FLAG, (1 if new_status else 0, image_path))
+        return new_status
 
     def get_flagged(self) -> list[dict]:
         """Get all flagged registrations."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute("""
-                    SELECT * FROM registrations
-                    WHERE flagged = 1
-                    ORDER BY created_at DESC
-                """).fetchall()
-                return [self._row_to_dict(row) for row in rows]
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        rows = conn.execute(f"""
+            SELECT {FULL_COLUMNS} FROM registrations
+            WHERE flagged = 1
+            ORDER BY created_at_ns DESC
+        """).fetchall()
+        return [self._row_to_dict(row) for row in rows]
 
     # ─────────────────────────────────────────────────────────────
     # Rating Operations (like/dislike)
@@ -437,44 +639,29 @@ class RegistrationStore:
         # Clamp to valid range
         rating = max(-1, min(1, rating))
 
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                cursor = conn.execute(
-                    "UPDATE registrations SET rating = ? WHERE image_path = ?",
-                    (rating, image_path)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute(SQL_UPDATE_RATING, (rating, image_path))
+        return cursor.rowcount > 0
 
     def get_rating(self, image_path: str) -> Optional[int]:
         """Get the current rating of a registration."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT rating FROM registrations WHERE image_path = ?",
-                    (image_path,)
-                ).fetchone()
-                return row["rating"] if row else None
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT rating FROM registrations WHERE image_path = ?",
+            (image_path,)
+        ).fetchone()
+        return row["rating"] if row else None
 
     def get_by_rating(self, rating: int) -> list[dict]:
         """Get all registrations with a specific rating."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute("""
-                    SELECT * FROM registrations
-                    WHERE rating = ?
-                    ORDER BY created_at DESC
-                """, (rating,)).fetchall()
-                return [self._row_to_dict(row) for row in rows]
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        rows = conn.execute(f"""
+            SELECT {FULL_COLUMNS} FROM registrations
+            WHERE rating = ?
+            ORDER BY created_at_ns DESC
+        """, (rating,)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
 
     def get_liked(self) -> list[dict]:
         """Get all liked registrations (rating = 1)."""
@@ -490,77 +677,68 @@ class RegistrationStore:
 
     def get_workflow_inputs(self, workflow_name: str) -> dict:
         """Get all saved input values for a workflow."""
-        with self._db_lock:
-            conn = self._get_conn()
+        conn = self._get_conn()
+        rows = conn.execute(
+            "SELECT input_key, value FROM workflow_inputs WHERE workflow_name = ?",
+            (workflow_name,)
+        ).fetchall()
+        result = {}
+        for row in rows:
             try:
-                rows = conn.execute(
-                    "SELECT input_key, value FROM workflow_inputs WHERE workflow_name = ?",
-                    (workflow_name,)
-                ).fetchall()
-                result = {}
-                for row in rows:
-                    try:
-                        result[row["input_key"]] = json.loads(row["value"])
-                    except (json.JSONDecodeError, TypeError):
-                        result[row["input_key"]] = row["value"]
-                return result
-            finally:
-                conn.close()
+                result[row["input_key"]] = _loads(row["value"])
+            except (ValueError, TypeError):
+                value = row["value"]
+                if isinstance(value, bytes):
+                    value = value.decode("utf-8", "replace")
+                result[row["input_key"]] = value
+        return result
 
     def set_workflow_input(self, workflow_name: str, input_key: str, value) -> bool:
         """Save a single input value for a workflow."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                json_value = json.dumps(value)
-                conn.execute("""
-                    INSERT OR REPLACE INTO workflow_inputs
-                        (workflow_name, input_key, value, updated_at)
-                    VALUES (?, ?, ?, ?)
-                """, (workflow_name, input_key, json_value, time.time()))
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        json_value = _dumps(value)
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO workflow_inputs
+                    (workflow_name, input_key, value, updated_at)
+                VALUES (?, ?, ?, ?)
+            """, (workflow_name, input_key, json_value, time.time()))
+        return True
 
     def set_workflow_inputs(self, workflow_name: str, inputs: dict) -> bool:
         """Save multiple input values for a workflow (replaces all existing)."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                now = time.time()
-                # Clear existing inputs first - this gives REPLACE semantics
-                # so that inputs removed from the dict (set to default) are deleted
-                conn.execute(
-                    "DELETE FROM workflow_inputs WHERE workflow_name = ?",
-                    (workflow_name,)
-                )
-                # Insert new values
-                for key, value in inputs.items():
-                    json_value = json.dumps(value)
-                    conn.execute("""
-                        INSERT INTO workflow_inputs
-                            (workflow_name, input_key, value, updated_at)
-                        VALUES (?, ?, ?, ?)
-                    """, (workflow_name, key, json_value, now))
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+        # Serialize before taking the lock
+        now = time.time()
+        rows = [
+            (workflow_name, key, _dumps(value), now)
+            for key, value in inputs.items()
+        ]
+        conn = self._get_conn()
+        with conn:
+            # One transaction: the delete and all inserts commit together
+            conn.execute("BEGIN IMMEDIATE")
+            # Clear existing inputs first - this gives REPLACE semantics
+            # so that inputs removed from the dict (set to default) are deleted
+            conn.execute(
+                "DELETE FROM workflow_inputs WHERE workflow_name = ?",
+                (workflow_name,)
+            )
+            conn.executemany("""
+                INSERT INTO workflow_inputs
+                    (workflow_name, input_key, value, updated_at)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+        return True
 
     def clear_workflow_inputs(self, workflow_name: str) -> bool:
         """Delete all saved inputs for a workflow (reset to defaults)."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "DELETE FROM workflow_inputs WHERE workflow_name = ?",
-                    (workflow_name,)
-                )
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM workflow_inputs WHERE workflow_name = ?",
+                (workflow_name,)
+            )
+        return True
 
     # ─────────────────────────────────────────────────────────────
     # Settings (key-value store)
@@ -568,30 +746,22 @@ class RegistrationStore:
 
     def get_setting(self, key: str) -> Optional[str]:
         """Get a setting value by key."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT value FROM settings WHERE key = ?", (key,)
-                ).fetchone()
-                return row["value"] if row else None
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
 
     def set_setting(self, key: str, value: str) -> bool:
         """Set a setting value."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                now = time.time()
-                conn.execute("""
-                    INSERT OR REPLACE INTO settings (key, value, updated_at)
-                    VALUES (?, ?, ?)
-                """, (key, value, now))
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        now = time.time()
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO settings (key, value, updated_at)
+                VALUES (?, ?, ?)
+            """, (key, value, now))
+        return True
 
     # ─────────────────────────────────────────────────────────────
     # Utility
@@ -599,53 +769,38 @@ class RegistrationStore:
 
     def is_registered(self, image_path: str) -> bool:
         """Check if an image is already registered."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT 1 FROM registrations WHERE image_path = ?", (image_path,)
-                ).fetchone()
-                return row is not None
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        return bool(conn.execute(SQL_CHECK_EXISTS, (image_path,)).fetchone()[0])
 
     def get_stats(self) -> dict:
         """Get registration statistics."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                total = conn.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
-                flagged = conn.execute(
-                    "SELECT COUNT(*) FROM registrations WHERE flagged = 1"
-                ).fetchone()[0]
-                with_char = conn.execute(
-                    "SELECT COUNT(*) FROM registrations WHERE char_str IS NOT NULL"
-                ).fetchone()[0]
-
-                return {
-                    "total": total,
-                    "flagged": flagged,
-                    "with_char_str": with_char,
-                }
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        total = conn.execute(SQL_COUNT_ALL).fetchone()[0]
+        flagged = conn.execute(
+            "SELECT COUNT(*) FROM registrations WHERE flagged = 1"
+        ).fetchone()[0]
+        with_char = conn.execute(
+            "SELECT COUNT(*) FROM registrations WHERE char_str IS NOT NULL"
+        ).fetchone()[0]
+
+        return {
+            "total": total,
+            "flagged": flagged,
+            "with_char_str": with_char,
+        }
 
     def delete_by_image(self, image_path: str) -> bool:
         """Delete a registration by image path."""
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                cursor = conn.execute(
-                    "DELETE FROM registrations WHERE image_path = ?",
-                    (image_path,)
-                )
-                conn.commit()
-                deleted = cursor.rowcount > 0
-                if deleted:
-                    log.info(f"Deleted registration: {image_path}")
-                return deleted
-            finally:
-                conn.close()
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM registrations WHERE image_path = ?",
+                (image_path,)
+            )
+        deleted = cursor.rowcount > 0
+        if deleted:
+            log.info(f"Deleted registration: {image_path}")
+        return deleted
 
     def cleanup_orphaned(self, output_dir: Path, dry_run: bool = False) -> dict:
         """
@@ -658,47 +813,51 @@ class RegistrationStore:
         Returns:
             Dict with 'deleted' count and list of 'orphaned' paths
         """
-        orphaned = []
-
-        with self._db_lock:
-            conn = self._get_conn()
-            try:
-                # Get all registered image paths
-                rows = conn.execute("SELECT image_path FROM registrations").fetchall()
-
-                for row in rows:
-                    image_path = row["image_path"]
-                    full_path = output_dir / image_path
-
-                    if not full_path.exists():
-                        orphaned.append(image_path)
-
-                if orphaned and not dry_run:
-                    # Delete orphaned registrations
-                    placeholders = ",".join("?" * len(orphaned))
+        # One walk of the output tree instead of a stat per registration
+        root_dir = os.fspath(output_dir)
+        existing = set()
+        for root, _dirs, files in os.walk(root_dir):
+            rel_root = os.path.relpath(root, root_dir)
+            for name in files:
+                existing.add(name if rel_root == "." else os.path.join(rel_root, name))
+
+        conn = self._get_conn()
+        # Get all registered image paths
+        rows = conn.execute("SELECT image_path FROM registrations").fetchall()
+
+        # Confirm misses individually: the walk doesn't follow symlinked
+        # directories or see paths written in a non-native form
+        orphaned = [
+            row["image_path"] for row in rows
+            if row["image_path"] not in existing
+            and not (output_dir / row["image_path"]).exists()
+        ]
+
+        if orphaned and not dry_run:
+            # Delete orphaned registrations in one transaction, chunked
+            # to stay under SQLite's bound-parameter limit
+            size = self.DELETE_CHUNK_SIZE
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for start in range(0, len(orphaned), size):
+                    chunk = orphaned[start:start + size]
+                    placeholders = ",".join("?" * len(chunk))
                     conn.execute(
                         f"DELETE FROM registrations WHERE image_path IN ({placeholders})",
-                        orphaned
+                        chunk
                     )
-                    conn.commit()
-                    log.info(f"Cleaned up {len(orphaned)} orphaned registrations")
-
-                return {
-                    "deleted": len(orphaned) if not dry_run else 0,
-                    "orphaned": orphaned,
-                    "dry_run": dry_run,
-                }
-            finally:
-                conn.close()
-
-
-# Global instance
-_store: Optional[RegistrationStore] = None
+            # A mass delete skews the row estimates
+            self._analyze(conn)
+            log.info(f"Cleaned up {len(orphaned)} orphaned registrations")
+
+        return {
+            "deleted": len(orphaned) if not dry_run else 0,
+            "orphaned": orphaned,
+            "dry_run": dry_run,
+        }
 
 
+@cache
 def get_store() -> RegistrationStore:
     """Get the global RegistrationStore instance."""
-    global _store
-    if _store is None:
-        _store = RegistrationStore()
-    return _store
+    return RegistrationStore()
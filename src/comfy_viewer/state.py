@@ -7,19 +7,105 @@ which then broadcasts updates to connected WebSocket clients.
 
 import json
 import logging
+import os
 import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Any, Callable, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
 log = logging.getLogger("comfy-viewer.state")
 
+# Events that replace whole collections carry a full state snapshot; every
+# other broadcast is a delta and clients apply its "data" themselves.
+_HEAVY_EVENTS = frozenset({"full_state", "images_updated", "templates_updated", "settings_updated"})
+
+
+def _encode(message: dict) -> bytes:
+    """Serialize a broadcast message to JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, default=str)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib handles those
+    return json.dumps(message, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _max_in_memory_images() -> int:
+    value = os.environ.get("COMFY_VIEWER_MAX_IMAGES")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            log.warning(f"Ignoring invalid COMFY_VIEWER_MAX_IMAGES: {value}")
+    return 5000
+
+
+# Upper bound on images kept in live state; the oldest fall off the end
+MAX_IN_MEMORY_IMAGES = _max_in_memory_images()
+
+
+class RWLock:
+    """
+    Writer-preferring reader/writer lock.
+
+    Any number of readers may hold the lock together; a writer waits for
+    them to drain and blocks new readers while it is queued, so a steady
+    stream of snapshot reads cannot starve state updates. The thread
+    holding the write lock may also take the read lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writers_waiting = 0
+
+    @contextmanager
+    def rlock(self):
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def wlock(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
 
 @dataclass
 class GenerationState:
     """Tracks ongoing generation jobs."""
     is_generating: bool = False
-    queued: list[str] = field(default_factory=list)  # prompt_ids
+    queued: dict[str, None] = field(default_factory=dict)  # prompt_ids, in queue order
     current_prompt_id: Optional[str] = None
     progress: float = 0.0  # 0-100
     completed: int = 0
@@ -38,7 +124,7 @@ class AppState:
     settings: list[dict] = field(default_factory=list)
 
     # Images
-    images: list[dict] = field(default_factory=list)
+    images: deque = field(default_factory=lambda: deque(maxlen=MAX_IN_MEMORY_IMAGES))
     images_total: int = 0
 
     # Generation
@@ -47,6 +133,8 @@ class AppState:
     def to_dict(self) -> dict:
         """Convert to JSON-serializable dict."""
         d = asdict(self)
+        d["images"] = list(d["images"])
+        d["generation"]["queued"] = list(d["generation"]["queued"])
         return d
 
 
@@ -56,10 +144,14 @@ class StateManager:
 
     Usage:
         state = StateManager()
-        state.subscribe(callback)  # Called on any state change
+        state.subscribe(callback)  # Called as callback(message, payload) on any state change
         state.update_templates(['t1', 't2'])  # Triggers broadcast
     """
 
+    # Minimum spacing between generation_progress broadcasts (seconds);
+    # updates arriving faster are coalesced into one trailing broadcast.
+    PROGRESS_INTERVAL = 0.05
+
     _instance = None
     _lock = threading.Lock()
 
@@ -76,8 +168,17 @@ class StateManager:
             return
 
         self._state = AppState()
-        self._subscribers: list[Callable[[dict], None]] = []
-        self._state_lock = threading.RLock()
+        self._subscribers: dict[int, Callable[[dict, bytes], None]] = {}
+        self._next_sub_id = 0
+        self._state_lock = RWLock()
+        self._state_dict = self._build_state_dict()
+        self._settings_index: dict[tuple[Any, Any], dict] = {}
+        self._last_progress_ts = 0.0
+        self._progress_timer: Optional[threading.Timer] = None
+        # Broadcasts queued in mutation order (under the write lock) and
+        # delivered by whichever thread holds _outbox_lock
+        self._outbox: deque[tuple[dict, list]] = deque()
+        self._outbox_lock = threading.Lock()
         self._initialized = True
 
         log.info("StateManager initialized")
@@ -87,34 +188,123 @@ class StateManager:
         """Read-only access to current state."""
         return self._state
 
-    def subscribe(self, callback: Callable[[dict], None]) -> Callable[[], None]:
+    def subscribe(self, callback: Callable[[dict, bytes], None]) -> Callable[[], None]:
         """
         Subscribe to state changes.
+
+        The callback receives the message dict and the same message already
+        encoded as JSON bytes, which is serialized once per event no matter
+        how many subscribers there are.
         Returns an unsubscribe function.
         """
-        self._subscribers.append(callback)
-        log.debug(f"Subscriber added, total: {len(self._subscribers)}")
+        with self._state_lock.wlock():
+            token = self._next_sub_id
+            self._next_sub_id += 1
+            self._subscribers[token] = callback
+        log.debug("Subscriber added, total: %d", len(self._subscribers))
 
         def unsubscribe():
-            if callback in self._subscribers:
-                self._subscribers.remove(callback)
-                log.debug(f"Subscriber removed, total: {len(self._subscribers)}")
+            with self._state_lock.wlock():
+                removed = self._subscribers.pop(token, None)
+            if removed is not None:
+                log.debug("Subscriber removed, total: %d", len(self._subscribers))
 
         return unsubscribe
 
-    def _broadcast(self, event_type: str, data: Optional[dict] = None):
-        """Notify all subscribers of a state change."""
+    def _build_state_dict(self) -> dict:
+        """
+        Build the serializable mirror of _state.
+
+        Lists are shared with the dataclass rather than copied; setters
+        patch the mirror alongside the dataclass so broadcasts never need
+        a full asdict() walk. images (a deque, kept only on the dataclass)
+        and generation.queued are filled in by _snapshot.
+        """
+        gen = self._state.generation
+        return {
+            "comfy_connected": self._state.comfy_connected,
+            "templates": self._state.templates,
+            "current_template": self._state.current_template,
+            "settings": self._state.settings,
+            "images_total": self._state.images_total,
+            "generation": {
+                "is_generating": gen.is_generating,
+                "current_prompt_id": gen.current_prompt_id,
+                "progress": gen.progress,
+                "completed": gen.completed,
+                "total": gen.total,
+            },
+        }
+
+    def _snapshot(self) -> dict:
+        """
+        Copy of the state mirror, safe to hand out past the lock.
+
+        Payloads are encoded after the lock is released, so everything
+        mutated in place (the images deque, generation) is copied; otherwise
+        a snapshot could pick up images whose image_added delta follows it,
+        and clients would show them twice. Setting values are patched in
+        place too, but their setting_changed deltas are idempotent, so the
+        settings list is shared.
+        """
+        snapshot = dict(self._state_dict)
+        snapshot["images"] = list(self._state.images)
+        snapshot["generation"] = dict(snapshot["generation"])
+        snapshot["generation"]["queued"] = list(self._state.generation.queued)
+        return snapshot
+
+    def _prepare_broadcast(self, event_type: str, data: Optional[dict] = None) -> None:
+        """
+        Build a broadcast message and queue it with a snapshot of the subscribers.
+
+        Called with the write lock held, so the state captured matches the
+        mutation that triggered it and the outbox is in mutation order;
+        _dispatch delivers it once the lock is released. Only _HEAVY_EVENTS
+        include "state"; the rest (progress, setting_changed, image_added,
+        ...) are deltas described entirely by "data".
+        """
         message = {
             "type": event_type,
             "data": data or {},
-            "state": self._state.to_dict()
         }
+        with self._state_lock.rlock():
+            if event_type in _HEAVY_EVENTS:
+                message["state"] = self._snapshot()
+            subscribers = list(self._subscribers.items())
+        if subscribers:
+            self._outbox.append((message, subscribers))
+
+    def _dispatch(self):
+        """
+        Deliver queued broadcasts in order. Must run without the state lock.
 
-        for callback in self._subscribers:
+        Only one thread delivers at a time; a thread that finds another
+        one delivering leaves its messages to it, so subscribers see events
+        in the order the mutations happened (and a callback that mutates
+        state has its event delivered after the current one).
+        """
+        while self._outbox:
+            if not self._outbox_lock.acquire(blocking=False):
+                return
             try:
-                callback(message)
+                while self._outbox:
+                    self._deliver(*self._outbox.popleft())
+            finally:
+                self._outbox_lock.release()
+
+    def _deliver(self, message: dict, subscribers: list):
+        """
+        Send one message to its subscribers, encoded once.
+
+        A callback that raises is logged and stays subscribed, so a
+        transient failure doesn't silence it for later broadcasts.
+        """
+        payload = _encode(message)
+        for _, callback in subscribers:
+            try:
+                callback(message, payload)
             except Exception as e:
-                log.error(f"Subscriber callback failed: {e}")
+                log.error(f"Subscriber callback failed: {e}", exc_info=e)
 
     # ─────────────────────────────────────────────────────────────
     # State Update Methods - Each triggers a broadcast
@@ -122,63 +312,105 @@ class StateManager:
 
     def set_comfy_connected(self, connected: bool):
         """Update ComfyUI connection status."""
-        with self._state_lock:
+        with self._state_lock.wlock():
             if self._state.comfy_connected != connected:
                 self._state.comfy_connected = connected
-                self._broadcast("comfy_status", {"connected": connected})
+                self._state_dict["comfy_connected"] = connected
+                self._prepare_broadcast("comfy_status", {"connected": connected})
+        self._dispatch()
 
     def set_templates(self, templates: list[str]):
-        """Update available templates list."""
-        with self._state_lock:
+        """Update available templates list. Unchanged lists are not rebroadcast."""
+        with self._state_lock.wlock():
+            if templates == self._state.templates and (
+                self._state.current_template or not templates
+            ):
+                return
             self._state.templates = templates
             if templates and not self._state.current_template:
                 self._state.current_template = templates[0]
-            self._broadcast("templates_updated", {"templates": templates})
+            self._state_dict["templates"] = templates
+            self._state_dict["current_template"] = self._state.current_template
+            self._prepare_broadcast("templates_updated", {"templates": templates})
+        self._dispatch()
 
     def set_current_template(self, template: str):
         """Switch to a different template."""
-        with self._state_lock:
+        with self._state_lock.wlock():
             if template in self._state.templates:
                 self._state.current_template = template
-                self._broadcast("template_changed", {"template": template})
+                self._state_dict["current_template"] = template
+                self._prepare_broadcast("template_changed", {"template": template})
+        self._dispatch()
 
     def set_settings(self, settings: list[dict]):
-        """Update current template settings."""
-        with self._state_lock:
+        """Update current template settings. Unchanged settings are not rebroadcast."""
+        with self._state_lock.wlock():
+            # Full equality rather than a (node_id, internalName, value)
+            # signature: switching templates can keep those and still change
+            # labels or options.
+            if settings == self._state.settings:
+                return
             self._state.settings = settings
-            self._broadcast("settings_updated", {"settings": settings})
+            self._state_dict["settings"] = settings
+            # Reversed so the first of any duplicate keys wins, as a scan would
+            self._settings_index = {
+                (s.get("node_id"), s.get("internalName")): s for s in reversed(settings)
+            }
+            self._prepare_broadcast("settings_updated", {"settings": settings})
+        self._dispatch()
 
     def update_setting(self, node_id: str, internal_name: str, value: Any):
         """Update a single setting value."""
-        with self._state_lock:
-            for setting in self._state.settings:
-                if setting.get("node_id") == node_id and setting.get("internalName") == internal_name:
-                    setting["value"] = value
-                    self._broadcast("setting_changed", {
-                        "node_id": node_id,
-                        "internalName": internal_name,
-                        "value": value
-                    })
-                    return True
-            return False
+        with self._state_lock.wlock():
+            setting = self._settings_index.get((node_id, internal_name))
+            if setting is not None:
+                setting["value"] = value
+                self._prepare_broadcast("setting_changed", {
+                    "node_id": node_id,
+                    "internalName": internal_name,
+                    "value": value
+                })
+        self._dispatch()
+        return setting is not None
 
     def set_images(self, images: list[dict], total: Optional[int] = None):
         """Update images list (typically from pagination)."""
-        with self._state_lock:
-            self._state.images = images
+        with self._state_lock.wlock():
+            self._state.images = deque(images, maxlen=MAX_IN_MEMORY_IMAGES)
             if total is not None:
                 self._state.images_total = total
-            self._broadcast("images_updated", {
+            self._state_dict["images_total"] = self._state.images_total
+            self._prepare_broadcast("images_updated", {
                 "images": images,
                 "total": self._state.images_total
             })
+        self._dispatch()
 
     def add_image(self, image: dict):
         """Add a new image to the front of the list."""
-        with self._state_lock:
-            self._state.images.insert(0, image)
+        with self._state_lock.wlock():
+            self._state.images.appendleft(image)
             self._state.images_total += 1
-            self._broadcast("image_added", {"image": image})
+            self._state_dict["images_total"] = self._state.images_total
+            self._prepare_broadcast("image_added", {"image": image})
+        self._dispatch()
+
+    def add_images_batch(self, images: list[dict]):
+        """
+        Add several new images with a single lock acquisition and broadcast.
+
+        Images are given in arrival order, so the last one ends up at the
+        front of the list, as if add_image had been called for each.
+        """
+        if not images:
+            return
+        with self._state_lock.wlock():
+            self._state.images.extendleft(images)
+            self._state.images_total += len(images)
+            self._state_dict["images_total"] = self._state.images_total
+            self._prepare_broadcast("images_added_batch", {"images": images})
+        self._dispatch()
 
     # ─────────────────────────────────────────────────────────────
     # Generation State Methods
@@ -186,79 +418,128 @@ class StateManager:
 
     def start_generation(self, count: int):
         """Begin a generation batch."""
-        with self._state_lock:
+        with self._state_lock.wlock():
             gen = self._state.generation
             gen.is_generating = True
             gen.total = count
             gen.completed = 0
-            gen.queued = []
+            gen.queued = {}
             gen.progress = 0.0
-            self._broadcast("generation_started", {"total": count})
+            self._state_dict["generation"].update(
+                is_generating=True, total=count, completed=0, progress=0.0
+            )
+            self._prepare_broadcast("generation_started", {"total": count})
+        self._dispatch()
 
     def add_to_queue(self, prompt_id: str):
         """Add a prompt to the generation queue."""
-        with self._state_lock:
-            self._state.generation.queued.append(prompt_id)
-            self._broadcast("prompt_queued", {"prompt_id": prompt_id})
+        with self._state_lock.wlock():
+            self._state.generation.queued[prompt_id] = None
+            self._prepare_broadcast("prompt_queued", {"prompt_id": prompt_id})
+        self._dispatch()
 
     def set_generation_progress(self, prompt_id: str, progress: float):
         """Update progress for current generation (0-100)."""
-        with self._state_lock:
+        with self._state_lock.wlock():
             gen = self._state.generation
             gen.current_prompt_id = prompt_id
             gen.progress = progress
-            self._broadcast("generation_progress", {
-                "prompt_id": prompt_id,
-                "progress": progress
-            })
+            gen_dict = self._state_dict["generation"]
+            gen_dict["current_prompt_id"] = prompt_id
+            gen_dict["progress"] = progress
+
+            elapsed = time.monotonic() - self._last_progress_ts
+            if elapsed >= self.PROGRESS_INTERVAL:
+                self._progress_broadcast()
+            elif self._progress_timer is None:
+                # Too soon: flush the latest value once the interval is up
+                self._progress_timer = threading.Timer(
+                    self.PROGRESS_INTERVAL - elapsed, self._flush_progress
+                )
+                self._progress_timer.daemon = True
+                self._progress_timer.start()
+        self._dispatch()
+
+    def _progress_broadcast(self) -> None:
+        """Queue a generation_progress broadcast from current state. Requires write lock."""
+        gen = self._state.generation
+        self._last_progress_ts = time.monotonic()
+        self._prepare_broadcast("generation_progress", {
+            "prompt_id": gen.current_prompt_id,
+            "progress": gen.progress
+        })
+
+    def _flush_progress(self):
+        """Timer callback: send the progress value coalesced since the last broadcast."""
+        with self._state_lock.wlock():
+            self._progress_timer = None
+            if self._state.generation.current_prompt_id is not None:
+                self._progress_broadcast()
+        self._dispatch()
+
+    def _cancel_progress_flush(self):
+        """Drop a pending coalesced progress broadcast. Requires write lock."""
+        if self._progress_timer is not None:
+            self._progress_timer.cancel()
+            self._progress_timer = None
 
     def complete_generation(self, prompt_id: str):
         """Mark a single generation as complete."""
-        with self._state_lock:
+        with self._state_lock.wlock():
+            self._cancel_progress_flush()
             gen = self._state.generation
-            if prompt_id in gen.queued:
-                gen.queued.remove(prompt_id)
+            gen.queued.pop(prompt_id, None)
             gen.completed += 1
             gen.current_prompt_id = None
             gen.progress = 0.0
 
             # Check if batch is done
-            if gen.completed >= gen.total:
+            batch_done = gen.completed >= gen.total
+            if batch_done:
                 gen.is_generating = False
-                self._broadcast("generation_batch_complete", {
+            self._state_dict["generation"].update(
+                completed=gen.completed, current_prompt_id=None, progress=0.0,
+                is_generating=gen.is_generating,
+            )
+            if batch_done:
+                self._prepare_broadcast("generation_batch_complete", {
                     "completed": gen.completed,
                     "total": gen.total
                 })
             else:
-                self._broadcast("generation_complete", {
+                self._prepare_broadcast("generation_complete", {
                     "prompt_id": prompt_id,
                     "completed": gen.completed,
                     "total": gen.total
                 })
+        self._dispatch()
 
     def cancel_generation(self):
         """Cancel ongoing generation batch."""
-        with self._state_lock:
+        with self._state_lock.wlock():
+            self._cancel_progress_flush()
             gen = self._state.generation
             gen.is_generating = False
-            gen.queued = []
+            gen.queued = {}
             gen.current_prompt_id = None
             gen.progress = 0.0
-            self._broadcast("generation_cancelled", {
+            self._state_dict["generation"].update(
+                is_generating=False, current_prompt_id=None, progress=0.0
+            )
+            self._prepare_broadcast("generation_cancelled", {
                 "completed": gen.completed,
                 "total": gen.total
             })
+        self._dispatch()
 
     # ─────────────────────────────────────────────────────────────
-    # Snapshot for new clients
-    # ─────────────────────────────────────────────────────────────
 
     def get_full_state(self) -> dict:
         """Get complete state snapshot for new WebSocket clients."""
-        with self._state_lock:
+        with self._state_lock.rlock():
             return {
                 "type": "full_state",
-                "state": self._state.to_dict()
+                "state": self._snapshot()
             }
 
 
@@ -5,39 +5,118 @@ Generates and caches thumbnails for images, following a similar pattern
 to the freedesktop.org thumbnail spec but simplified for our use case.
 
 Cache location: platform cache dir /comfy-viewer/thumbnails/
+
+Cache keys include the source file's mtime, so modifying an image
+changes its key; the stale thumbnail becomes an orphan for
+cleanup_orphaned_thumbnails instead of being served.
 """
 
 import hashlib
 import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional, Union
 
-from PIL import Image
+import PIL
+from PIL import Image, features
 from platformdirs import user_cache_dir
 
+try:
+    import pyvips
+except (ImportError, OSError):  # pragma: no cover - optional accelerator
+    pyvips = None
+
 log = logging.getLogger("comfy-viewer.thumbnails")
 
 # Thumbnail settings
 THUMBNAIL_SIZE = (256, 256)  # Max dimensions (aspect ratio preserved)
 THUMBNAIL_QUALITY = 85  # JPEG/WebP quality
+# libwebp encode effort (0-6, default 4). 0 is the fastest lossy method and
+# costs little size at 256px. If lossless is ever enabled, `quality` becomes
+# an effort knob too and should then be kept low.
+THUMBNAIL_METHOD = 0
 THUMBNAIL_FORMAT = "WEBP"  # Small file size, good quality
+# Images handed to a pool worker per task in generate_all_thumbnails;
+# batching amortizes the pickling/IPC cost of these small tasks.
+THUMBNAIL_CHUNKSIZE = 16
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+# Resampling filters. LANCZOS (6x6 window) is worth its cost for the main
+# 256px view; at micro-preview sizes its extra sharpness is invisible, so
+# anything up to MICRO_MAX_DIM uses the much cheaper BOX filter.
+THUMBNAIL_FILTER = Image.Resampling.LANCZOS
+MICRO_FILTER = Image.Resampling.BOX
+MICRO_MAX_DIM = 128
 
 # Cache directory (cross-platform)
 CACHE_DIR = Path(user_cache_dir("comfy-viewer")) / "thumbnails"
 
+# Resampling and decode speed depend on the Pillow build: Pillow-SIMD
+# (versions ending in ".postN") vectorizes LANCZOS, libjpeg-turbo speeds
+# up JPEG decode. Both are drop-in; see README "Faster thumbnails".
+log.debug(
+    f"Pillow {PIL.__version__}, libjpeg-turbo: {features.check_feature('libjpeg_turbo')}, "
+    f"webp: {features.version_module('webp')}, pyvips: {pyvips is not None}"
+)
+
+
+def _path_hash(key: str) -> str:
+    """
+    Hash a cache key to a thumbnail filename stem.
+
+    SHA-256 (hardware-accelerated by OpenSSL on CPUs with SHA extensions)
+    truncated to 32 hex chars, which is ample for filename uniqueness.
+    """
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+@lru_cache(maxsize=16384)
+def _source_key(abs_path_str: str, mtime_ns: int) -> str:
+    """
+    Hashed cache key for an absolute, resolved source path and its mtime.
+
+    Memoized: gallery scans, cleanup and thumbnail requests hash the same
+    (path, mtime) pairs repeatedly. A modified source has a new mtime and
+    so a new entry; stale ones simply age out of the LRU.
+    """
+    return _path_hash(f"{abs_path_str}|{mtime_ns}")
+
+
+def _sized_filename(key: str, size: tuple[int, int]) -> str:
+    """Cache filename for a hashed key at one thumbnail size."""
+    return f"{key}_{size[0]}x{size[1]}.webp"
 
-def get_cache_path(image_path: Path) -> Path:
+
+def _thumb_filename(abs_path_str: str, mtime_ns: int, size: tuple[int, int] = THUMBNAIL_SIZE) -> str:
+    """Cache filename for an absolute, resolved source path, its mtime and a size."""
+    return _sized_filename(_source_key(abs_path_str, mtime_ns), size)
+
+
+def _get_cache_path_fast(abs_path_str: str, mtime_ns: int, size: tuple[int, int] = THUMBNAIL_SIZE) -> Path:
+    """get_cache_path for a path string that is already absolute and resolved."""
+    return CACHE_DIR / _thumb_filename(abs_path_str, mtime_ns, size)
+
+
+def get_cache_path(
+    image_path: Path,
+    mtime_ns: Optional[int] = None,
+    size: tuple[int, int] = THUMBNAIL_SIZE
+) -> Path:
     """
     Get the cache path for a thumbnail.
 
-    Uses MD5 hash of the absolute path for the filename,
-    similar to freedesktop.org spec.
+    Uses a hash of the absolute path and source mtime for the filename,
+    similar to freedesktop.org spec, suffixed with the thumbnail size so
+    each size is cached separately. Pass mtime_ns when the caller has
+    already stat'ed the source; otherwise it is read here.
     """
+    if mtime_ns is None:
+        mtime_ns = image_path.stat().st_mtime_ns
     # Hash the absolute path
-    path_str = str(image_path.resolve())
-    path_hash = hashlib.md5(path_str.encode()).hexdigest()
-
-    return CACHE_DIR / f"{path_hash}.webp"
+    return _get_cache_path_fast(str(image_path.resolve()), mtime_ns, size)
 
 
 def is_thumbnail_valid(image_path: Path, thumb_path: Path) -> bool:
@@ -59,64 +138,207 @@ def is_thumbnail_valid(image_path: Path, thumb_path: Path) -> bool:
         return False
 
 
-def generate_thumbnail(image_path: Path, force: bool = False) -> Optional[Path]:
+def _resample_filter(size: tuple[int, int]) -> Image.Resampling:
+    """Pick the resampling filter for a thumbnail size."""
+    return MICRO_FILTER if max(size) <= MICRO_MAX_DIM else THUMBNAIL_FILTER
+
+
+def _prepare_for_resize(img: Image.Image) -> Image.Image:
     """
-    Generate a thumbnail for an image.
+    Bring an image to RGB or RGBA so it can be resampled with any filter.
+
+    Transparency is kept so it can be flattened on the (much smaller)
+    thumbnail; palette images must be expanded first since Pillow only
+    resizes them with NEAREST.
+    """
+    if img.mode == 'P':
+        return img.convert('RGBA')
+    if img.mode not in ('RGB', 'RGBA'):
+        return img.convert('RGB')
+    return img
+
+
+def _flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """
+    Convert an image to RGB, compositing any transparency onto white.
+
+    Uses Image.alpha_composite (one fused pass) rather than split() +
+    paste(mask=...), which allocates a separate alpha band image.
+    """
+    if img.mode == 'P':
+        img = img.convert('RGBA')
+    if img.mode == 'RGBA':
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        return Image.alpha_composite(background, img).convert('RGB')
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _generate_with_vips(
+    image_path: Path,
+    pending: list[tuple[tuple[int, int], Path]],
+    results: dict[tuple[int, int], Path]
+) -> list[tuple[tuple[int, int], Path]]:
+    """
+    Generate thumbnails with libvips, adding them to results.
+
+    pyvips.Image.thumbnail shrinks on load and streams the source, so
+    large images are never fully decoded into memory. Returns the sizes
+    it could not produce, for the Pillow path to handle.
+    """
+    remaining = []
+    for size, thumb_path in pending:
+        try:
+            thumb = pyvips.Image.thumbnail(str(image_path), size[0], height=size[1], size="down")
+            if thumb.hasalpha():
+                thumb = thumb.flatten(background=[255, 255, 255])
+            thumb.write_to_file(str(thumb_path), Q=THUMBNAIL_QUALITY, effort=THUMBNAIL_METHOD)
+        except pyvips.Error as e:
+            log.debug(f"libvips could not thumbnail {image_path.name}, using Pillow: {e}")
+            remaining.append((size, thumb_path))
+            continue
+        results[size] = thumb_path
+        log.debug(f"Generated thumbnail: {thumb_path.name}")
+    return remaining
+
+
+def generate_thumbnails(
+    image_path: Path,
+    sizes: list[tuple[int, int]],
+    force: bool = False
+) -> dict[tuple[int, int], Path]:
+    """
+    Generate thumbnails of several sizes for an image.
+
+    The source is opened and decoded once; each missing size is then
+    resized from that decoded image, so extra sizes (e.g. @2x or a micro
+    preview) cost a resize and encode rather than another full decode.
 
     Args:
         image_path: Path to the source image
-        force: If True, regenerate even if cached thumbnail exists
+        sizes: Max (width, height) of each thumbnail to produce
+        force: If True, regenerate even if cached thumbnails exist
 
     Returns:
-        Path to the thumbnail, or None if generation failed
+        Dict mapping each size to its thumbnail path; sizes that failed
+        are missing
     """
     image_path = Path(image_path)
 
-    if not image_path.exists():
+    try:
+        mtime_ns = image_path.stat().st_mtime_ns
+    except OSError:
         log.warning(f"Source image not found: {image_path}")
-        return None
+        return {}
 
     # Check supported formats
     suffix = image_path.suffix.lower()
-    if suffix not in {".png", ".jpg", ".jpeg", ".webp"}:
+    if suffix not in IMAGE_EXTENSIONS:
         log.debug(f"Unsupported format for thumbnails: {suffix}")
-        return None
-
-    thumb_path = get_cache_path(image_path)
+        return {}
+
+    abs_path_str = str(image_path.resolve())
+    results = {}
+    pending = []
+    for size in sizes:
+        thumb_path = _get_cache_path_fast(abs_path_str, mtime_ns, size)
+        # The key changes with the source mtime, so existing means current
+        if not force and thumb_path.exists():
+            log.debug(f"Using cached thumbnail: {thumb_path.name}")
+            results[size] = thumb_path
+        else:
+            pending.append((size, thumb_path))
 
-    # Check cache validity
-    if not force and is_thumbnail_valid(image_path, thumb_path):
-        log.debug(f"Using cached thumbnail: {thumb_path.name}")
-        return thumb_path
+    if not pending:
+        return results
 
     # Ensure cache directory exists
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+    if pyvips is not None:
+        pending = _generate_with_vips(image_path, pending, results)
+        if not pending:
+            return results
+
     try:
         with Image.open(image_path) as img:
-            # Convert to RGB if necessary (for PNG with transparency)
-            if img.mode in ('RGBA', 'P'):
-                # Create white background for transparency
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # Generate thumbnail (maintains aspect ratio)
-            img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-
-            # Save as WebP for good compression
-            img.save(thumb_path, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
-
-        log.debug(f"Generated thumbnail: {thumb_path.name}")
-        return thumb_path
+            # Let libjpeg scale by 1/2..1/8 during decode (no-op for non-JPEG);
+            # draft to the largest size so every requested size stays sharp
+            img.draft("RGB", (
+                max(size[0] for size, _ in pending),
+                max(size[1] for size, _ in pending),
+            ))
+            source = _prepare_for_resize(img)
+            source.load()
+
+            for size, thumb_path in pending:
+                # Resize first (maintains aspect ratio), then flatten any
+                # transparency on the small result instead of the full image
+                thumb = source.copy()
+                thumb.thumbnail(size, _resample_filter(size))
+                thumb = _flatten_to_rgb(thumb)
+
+                # Save as WebP for good compression
+                thumb.save(thumb_path, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=THUMBNAIL_METHOD)
+                results[size] = thumb_path
+                log.debug(f"Generated thumbnail: {thumb_path.name}")
 
     except Exception as e:
         log.error(f"Failed to generate thumbnail for {image_path}: {e}")
-        return None
+
+    return results
+
+
+def generate_thumbnail(image_path: Path, force: bool = False) -> Optional[Path]:
+    """
+    Generate a thumbnail for an image.
+
+    Args:
+        image_path: Path to the source image
+        force: If True, regenerate even if cached thumbnail exists
+
+    Returns:
+        Path to the thumbnail, or None if generation failed
+    """
+    return generate_thumbnails(image_path, [THUMBNAIL_SIZE], force).get(THUMBNAIL_SIZE)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes via a temp file + rename so readers never see a partial file."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _iter_images(root: str, recursive: bool = False) -> Iterator[os.DirEntry]:
+    """
+    Yield a DirEntry for each supported image under root.
+
+    Walks with os.scandir and checks the extension on the bare name, so no
+    Path objects or lowered suffix strings are built for non-matching
+    entries. Symlinked files are included; symlinked directories are not
+    descended. Unreadable directories are logged and skipped.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                        continue
+                    name = entry.name
+                    dot = name.rfind(".")
+                    if dot > 0 and name[dot:].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                        yield entry
+        except OSError as e:
+            log.warning(f"Failed to scan {e.filename}: {e}")
 
 
 def get_thumbnail(image_path: Path) -> Optional[Path]:
@@ -128,7 +350,25 @@ def get_thumbnail(image_path: Path) -> Optional[Path]:
     return generate_thumbnail(image_path, force=False)
 
 
-def get_thumbnail_for_bytes(filename: str, image_data: bytes) -> Optional[bytes]:
+def _bytes_cache_path(filename: str) -> Path:
+    """Cache path for a remote image, keyed by its filename (hashed)."""
+    return CACHE_DIR / _sized_filename(_path_hash(filename), THUMBNAIL_SIZE)
+
+
+def get_cached_thumbnail_for_bytes(filename: str) -> Optional[bytes]:
+    """
+    Read the cached thumbnail for a remote image, if there is one.
+
+    Lets callers skip downloading the source image entirely on a hit.
+    For remote mode we can't check mtime, so any cached file is used.
+    """
+    try:
+        return _bytes_cache_path(filename).read_bytes()
+    except OSError:
+        return None
+
+
+def get_thumbnail_for_bytes(filename: str, image_data: Union[bytes, BinaryIO]) -> Optional[bytes]:
     """
     Generate a thumbnail from image bytes.
 
@@ -137,58 +377,67 @@ def get_thumbnail_for_bytes(filename: str, image_data: bytes) -> Optional[bytes]
 
     Args:
         filename: Image filename (used for cache key)
-        image_data: Raw image bytes
+        image_data: Raw image bytes, or a binary file-like object that
+            Pillow reads lazily (e.g. a response stream)
 
     Returns:
         Thumbnail image data as bytes, or None if generation failed
     """
     import io
 
-    # Use filename hash for cache path (consistent with local mode)
-    cache_key = hashlib.md5(filename.encode()).hexdigest()
-    thumb_path = CACHE_DIR / f"{cache_key}.webp"
+    thumb_path = _bytes_cache_path(filename)
 
-    # Check if cached thumbnail exists and is still valid
-    # For remote mode, we can't check mtime, so just use if exists
-    if thumb_path.exists():
-        try:
-            return thumb_path.read_bytes()
-        except OSError:
-            pass  # Regenerate if read fails
+    # Use the cached thumbnail if present; regenerate if the read fails
+    cached = get_cached_thumbnail_for_bytes(filename)
+    if cached is not None:
+        return cached
 
     # Ensure cache directory exists
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+    # BytesIO shares the bytes buffer rather than copying it
+    source = io.BytesIO(image_data) if isinstance(image_data, (bytes, bytearray, memoryview)) else image_data
+    del image_data
+
     try:
-        # Load image from bytes
-        img = Image.open(io.BytesIO(image_data))
-
-        # Convert to RGB if necessary
-        if img.mode in ('RGBA', 'P'):
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-
-        # Generate thumbnail
-        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-
-        # Save to cache
-        img.save(thumb_path, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
-
-        # Also return the bytes
+        # Image.open only reads the header; pixels are decoded on first use,
+        # after draft() so libjpeg can scale by 1/2..1/8 during decode
+        img = Image.open(source)
+        img.draft("RGB", THUMBNAIL_SIZE)
+
+        # Resize first, then flatten transparency on the small result
+        img = _prepare_for_resize(img)
+        img.thumbnail(THUMBNAIL_SIZE, _resample_filter(THUMBNAIL_SIZE))
+        img = _flatten_to_rgb(img)
+
+        # Encode once; the same bytes go to the cache and the caller
         output = io.BytesIO()
-        img.save(output, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
-        return output.getvalue()
+        img.save(output, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=THUMBNAIL_METHOD)
+        data = output.getvalue()
+        try:
+            _write_atomic(thumb_path, data)
+        except OSError as e:
+            log.warning(f"Failed to cache thumbnail for {filename}: {e}")
+        return data
 
     except Exception as e:
         log.error(f"Failed to generate thumbnail for {filename}: {e}")
         return None
 
 
+def _generate_chunk(image_paths: list[str], force: bool) -> list[tuple[str, bool]]:
+    """Pool task for generate_all_thumbnails: (image_path, succeeded) per image."""
+    results = []
+    for image_path in image_paths:
+        try:
+            ok = generate_thumbnail(image_path, force) is not None
+        except Exception as e:
+            log.error(f"Thumbnail worker failed for {image_path}: {e}")
+            ok = False
+        results.append((image_path, ok))
+    return results
+
+
 def generate_all_thumbnails(
     source_dir: Path,
     force: bool = False,
@@ -197,10 +446,19 @@ def generate_all_thumbnails(
     """
     Generate thumbnails for all images in a directory.
 
+    Images are decoded, resized and encoded in a pool of worker processes
+    (one per CPU), so the work is not serialized on the GIL. The directory
+    is read in chunks of up to THUMBNAIL_CHUNKSIZE images (amortizing
+    per-task IPC) with at most two chunks per worker in flight, so listing
+    overlaps encoding and only a bounded number of paths is held at once.
+
     Args:
         source_dir: Directory containing source images
         force: If True, regenerate all thumbnails
-        callback: Optional callback(current, total, filename) for progress
+        callback: Optional callback(current, total, filename) for progress,
+            called in this process as each chunk finishes. total is the
+            number of images listed so far; it is final once the whole
+            directory has been read.
 
     Returns:
         Tuple of (successful, failed) counts
@@ -211,29 +469,58 @@ def generate_all_thumbnails(
         log.error(f"Source directory not found: {source_dir}")
         return 0, 0
 
-    # Find all images
-    extensions = {".png", ".jpg", ".jpeg", ".webp"}
-    images = [
-        p for p in source_dir.iterdir()
-        if p.suffix.lower() in extensions
-    ]
-
-    total = len(images)
-    successful = 0
-    failed = 0
+    log.info(f"Generating thumbnails in {source_dir}...")
 
-    log.info(f"Generating thumbnails for {total} images...")
+    workers = os.cpu_count() or 1
+    window = 2 * workers
 
-    for i, image_path in enumerate(images):
-        if callback:
-            callback(i + 1, total, image_path.name)
-
-        result = generate_thumbnail(image_path, force=force)
+    # Image paths as strings; generate_thumbnail wraps them
+    images = (entry.path for entry in _iter_images(str(source_dir)))
+    # The first window's worth is split evenly, so small folders still
+    # spread across every worker; after that, full chunks
+    head = list(islice(images, window * THUMBNAIL_CHUNKSIZE))
+    step = max(1, -(-len(head) // window))
+    chunks = chain(
+        (head[i:i + step] for i in range(0, len(head), step)),
+        iter(lambda: list(islice(images, THUMBNAIL_CHUNKSIZE)), []),
+    )
 
-        if result:
-            successful += 1
-        else:
-            failed += 1
+    listed = 0
+    successful = 0
+    failed = 0
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for chunk in islice(chunks, window):
+            listed += len(chunk)
+            pending[executor.submit(_generate_chunk, chunk, force)] = chunk
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    log.error(f"Thumbnail worker failed for {len(chunk)} images: {e}")
+                    results = [(image_path, False) for image_path in chunk]
+
+                # Top up the window before reporting, so workers stay busy
+                next_chunk = next(chunks, None)
+                if next_chunk:
+                    listed += len(next_chunk)
+                    pending[executor.submit(_generate_chunk, next_chunk, force)] = next_chunk
+
+                for image_path, ok in results:
+                    done += 1
+                    if ok:
+                        successful += 1
+                    else:
+                        failed += 1
+
+                    if callback:
+                        callback(done, listed, os.path.basename(image_path))
 
     log.info(f"Thumbnail generation complete: {successful} successful, {failed} failed")
     return successful, failed
@@ -287,10 +574,12 @@ def cleanup_orphaned_thumbnails(
     """
     Remove thumbnails that no longer have a corresponding source image.
 
-    Since thumbnails are named by MD5 hash of the source path, we:
+    Since thumbnails are named by a hash of the source path and mtime
+    (plus a size suffix), we:
     1. Scan source directory for all existing images
-    2. Compute expected thumbnail path for each
-    3. Remove any cached thumbnails not in the expected set
+    2. Compute the expected key for each
+    3. Remove any cached thumbnails, of any size, whose key is not in the
+       expected set
 
     Args:
         source_dir: Directory containing source images
@@ -312,35 +601,33 @@ def cleanup_orphaned_thumbnails(
         log.warning(f"Source directory not found: {source_dir}")
         return {"orphaned": 0, "removed": 0, "kept": 0, "freed_bytes": 0}
 
-    # Find all images in source directory
-    extensions = {".png", ".jpg", ".jpeg", ".webp"}
-    if recursive:
-        images = [
-            p for p in source_dir.rglob("*")
-            if p.is_file() and p.suffix.lower() in extensions
-        ]
-    else:
-        images = [
-            p for p in source_dir.iterdir()
-            if p.is_file() and p.suffix.lower() in extensions
-        ]
-
-    # Build set of valid thumbnail filenames
-    valid_thumbnails = set()
-    for img_path in images:
-        thumb_path = get_cache_path(img_path)
-        valid_thumbnails.add(thumb_path.name)
+    # Find all images in source directory. Walking from the resolved root
+    # yields canonical paths, so only symlinked files need resolving to
+    # match get_cache_path.
+    images = []
+    for entry in _iter_images(os.path.realpath(source_dir), recursive):
+        path = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+        try:
+            images.append((path, entry.stat().st_mtime_ns))
+        except OSError as e:
+            log.warning(f"Failed to stat {entry.path}: {e}")
+
+    # Build set of valid cache keys (names only, no Path objects); every
+    # size of a thumbnail shares its source's key
+    valid_keys = {_source_key(img_path, mtime_ns) for img_path, mtime_ns in images}
 
     # Scan cached thumbnails and find orphans
-    cached_thumbnails = list(CACHE_DIR.glob("*.webp"))
     orphaned = []
     kept = 0
 
-    for thumb in cached_thumbnails:
-        if thumb.name in valid_thumbnails:
-            kept += 1
-        else:
-            orphaned.append(thumb)
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".webp"):
+                continue
+            if entry.name.partition("_")[0] in valid_keys:
+                kept += 1
+            else:
+                orphaned.append(entry)
 
     # Remove orphans
     removed = 0
@@ -350,11 +637,11 @@ def cleanup_orphaned_thumbnails(
         try:
             size = thumb.stat().st_size
             if not dry_run:
-                thumb.unlink()
+                os.unlink(thumb.path)
             removed += 1
             freed_bytes += size
         except OSError as e:
-            log.warning(f"Failed to remove orphaned thumbnail {thumb}: {e}")
+            log.warning(f"Failed to remove orphaned thumbnail {thumb.path}: {e}")
 
     action = "Would remove" if dry_run else "Removed"
     if removed > 0:
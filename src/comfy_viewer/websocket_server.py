@@ -7,6 +7,7 @@ the StateManager are automatically broadcast to connected clients.
 
 import json
 import logging
+import threading
 from typing import Optional
 
 from flask import Flask
@@ -19,15 +20,29 @@ log = logging.getLogger("comfy-viewer.websocket")
 # Will be initialized by the main app
 socketio: Optional[SocketIO] = None
 
+# Broadcasts arriving within this window (seconds) go out as one frame
+BATCH_WINDOW = 0.025
 
-def init_socketio(app: Flask) -> SocketIO:
-    """Initialize SocketIO with the Flask app."""
+_pending: list[bytes] = []
+_pending_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+
+def init_socketio(app: Flask, async_mode: str = "threading") -> SocketIO:
+    """
+    Initialize SocketIO with the Flask app.
+
+    async_mode "eventlet"/"gevent" serves many clients on green threads
+    instead of one OS thread each; the package must be installed and the
+    process monkey-patched before import (e.g. run under
+    `gunicorn -k eventlet`).
+    """
     global socketio
 
     socketio = SocketIO(
         app,
         cors_allowed_origins="*",
-        async_mode="threading",
+        async_mode=async_mode,
         logger=False,
         engineio_logger=False
     )
@@ -61,17 +76,49 @@ def init_socketio(app: Flask) -> SocketIO:
     return socketio
 
 
-def _broadcast_to_clients(message: dict):
+def _broadcast_to_clients(message: dict, payload: bytes):
     """
     Callback for StateManager - broadcasts state changes to all clients.
 
-    This is called automatically whenever state changes.
+    This is called automatically whenever state changes. Payloads are
+    queued and flushed after BATCH_WINDOW, so a burst of changes costs one
+    emit instead of one per change.
     """
+    global _flush_timer
     if socketio is None:
         return
 
+    with _pending_lock:
+        _pending.append(payload)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(BATCH_WINDOW, _flush_pending)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def _flush_pending():
+    """
+    Send queued broadcasts to all clients.
+
+    Pre-encoded JSON payloads are sent as binary frames so Socket.IO does
+    not re-serialize them: a single message as "state", several as a
+    "state_batch" JSON array (spliced from the encoded messages) that
+    clients apply in order.
+    """
+    global _flush_timer
+    with _pending_lock:
+        batch = _pending[:]
+        _pending.clear()
+        _flush_timer = None
+
+    if not batch or socketio is None:
+        return
+
     try:
-        socketio.emit("state", message)
+        if len(batch) == 1:
+            socketio.emit("state", batch[0])
+        else:
+            socketio.emit("state_batch", b"[" + b",".join(batch) + b"]")
     except Exception as e:
         log.error(f"Failed to broadcast to clients: {e}")
 
@@ -26,6 +26,7 @@ class StateManager {
 
     this.subscribers = new Map(); // key -> Set of callbacks
     this.socket = null;
+    this.decoder = new TextDecoder();
     this.reconnectDelay = 1000;
     this.maxReconnectDelay = 30000;
   }
@@ -56,10 +57,21 @@ class StateManager {
       this._notify("disconnected", {});
     });
 
+    // Broadcasts arrive as pre-encoded JSON bytes; snapshots as objects
     this.socket.on("state", (message) => {
+      if (message instanceof ArrayBuffer) {
+        message = JSON.parse(this.decoder.decode(message));
+      }
       this._handleMessage(message);
     });
 
+    // Bursts of broadcasts arrive as one JSON array, applied in order
+    this.socket.on("state_batch", (batch) => {
+      for (const message of JSON.parse(this.decoder.decode(batch))) {
+        this._handleMessage(message);
+      }
+    });
+
     this.socket.on("connect_error", (error) => {
       console.error("WebSocket error:", error);
     });
@@ -71,9 +83,11 @@ class StateManager {
   _handleMessage(message) {
     const { type, data, state: newState } = message;
 
-    // Update local state
+    // Update local state: heavy events carry a snapshot, the rest are deltas
     if (newState) {
       this._mergeState(newState);
+    } else if (data) {
+      this._applyDelta(type, data);
     }
 
     // Notify subscribers based on event type
@@ -97,6 +111,78 @@ class StateManager {
     Object.assign(this.state, newState);
   }
 
+  /**
+   * Apply a delta-only event (no state snapshot attached) to local state.
+   */
+  _applyDelta(type, data) {
+    const gen = this.state.generation;
+
+    switch (type) {
+      case "comfy_status":
+        this.state.comfy_connected = data.connected;
+        break;
+
+      case "template_changed":
+        this.state.current_template = data.template;
+        break;
+
+      case "setting_changed": {
+        const setting = this.state.settings.find(
+          (s) => s.node_id === data.node_id && s.internalName === data.internalName
+        );
+        if (setting) setting.value = data.value;
+        break;
+      }
+
+      case "image_added":
+        this.state.images.unshift(data.image);
+        this.state.images_total++;
+        break;
+
+      case "images_added_batch":
+        // Arrival order: the last image becomes the newest
+        for (const image of data.images) this.state.images.unshift(image);
+        this.state.images_total += data.images.length;
+        break;
+
+      case "generation_started":
+        Object.assign(gen, {
+          is_generating: true, total: data.total, completed: 0, queued: [], progress: 0,
+        });
+        break;
+
+      case "prompt_queued":
+        gen.queued.push(data.prompt_id);
+        break;
+
+      case "generation_progress":
+        gen.current_prompt_id = data.prompt_id;
+        gen.progress = data.progress;
+        break;
+
+      case "generation_complete":
+        gen.queued = gen.queued.filter((id) => id !== data.prompt_id);
+        Object.assign(gen, {
+          completed: data.completed, total: data.total, current_prompt_id: null, progress: 0,
+        });
+        break;
+
+      case "generation_batch_complete":
+        Object.assign(gen, {
+          is_generating: false, completed: data.completed, total: data.total,
+          current_prompt_id: null, progress: 0,
+        });
+        break;
+
+      case "generation_cancelled":
+        Object.assign(gen, {
+          is_generating: false, queued: [], completed: data.completed, total: data.total,
+          current_prompt_id: null, progress: 0,
+        });
+        break;
+    }
+  }
+
   /**
    * Subscribe to state changes.
    * @param {string} event - Event type to subscribe to, or '*' for all